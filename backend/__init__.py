@@ -0,0 +1,15 @@
+"""
+TrueTone backend package.
+
+The server runs from this directory (python main.py) and imports its modules as
+top-level ``services`` and ``utils``. Importing through ``backend`` (as the test
+scripts do) puts this directory on sys.path once, so shared modules such as
+utils.audio_kernels resolve under those same names from either entry point.
+"""
+
+import os
+import sys
+
+_BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+if _BACKEND_DIR not in sys.path:
+    sys.path.append(_BACKEND_DIR)
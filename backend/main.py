@@ -6,18 +6,36 @@ Main entry point for the TrueTone voice-preserving translation service.
 
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse, Response
 import uvicorn
-import json
+import orjson
+import numpy as np
 import logging
-from typing import Dict, Any
+from typing import Deque, Dict, Any, List, Optional
+from dataclasses import dataclass, field
+from collections import deque
 import asyncio
 import base64
+import itertools
+import psutil
+import socket
+import struct
 import time
 
+try:
+    import pybase64
+except ImportError:
+    pybase64 = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
 # Import our audio services
-from services.audio_capture import AudioCaptureService
+from services.audio_capture import AudioCaptureService, analysis_executor
 from services.audio_streaming import AudioStreamingService
+from utils.audio_kernels import warm_up as warm_up_kernels
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -27,7 +45,8 @@ logger = logging.getLogger(__name__)
 app = FastAPI(
     title="TrueTone API",
     description="Voice-preserving YouTube translation backend with real-time audio streaming",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse
 )
 
 # Add CORS middleware
@@ -39,224 +58,543 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Audio chunks waiting for processing per connection; the oldest is dropped when full
+CHUNK_QUEUE_SIZE = 64
+
+# Outbound backpressure: while this many messages wait for a slow client, chunk acks
+# are held back, and only the newest ACK_QUEUE_SIZE of them are kept. Replies to
+# client requests are always queued.
+OUTBOX_BACKLOG_LIMIT = 16
+ACK_QUEUE_SIZE = 256
+
+# Audio kept in a connection's capture buffer; older samples are trimmed first
+MAX_BUFFER_SECONDS = 30
+
+@dataclass(slots=True)
+class ConnectionRecord:
+    """Per-connection WebSocket state and services"""
+    websocket: WebSocket
+    audio_capture: AudioCaptureService
+    audio_streaming: AudioStreamingService
+    connected_at: float
+    last_activity: float
+    ack_queue: Deque[Dict[str, Any]] = field(default_factory=lambda: deque(maxlen=ACK_QUEUE_SIZE))
+    ack_flush_task: Optional[asyncio.Task] = None
+    chunk_queue: asyncio.Queue = field(default_factory=lambda: asyncio.Queue(maxsize=CHUNK_QUEUE_SIZE))
+    processor_task: Optional[asyncio.Task] = None
+    outbox: asyncio.Queue = field(default_factory=asyncio.Queue)
+    writer_task: Optional[asyncio.Task] = None
+    dropped_chunks: int = 0
+    sample_rate: int = 16000
+    use_msgpack: bool = False
+    # Reused for every chunk; chunks are processed one at a time by the processor task
+    chunk_metadata: Dict[str, Any] = field(default_factory=dict)
+    # float32 scratch for widened int16 chunks, grown on demand
+    pcm_scratch: np.ndarray = field(default_factory=lambda: np.empty(0, dtype=np.float32))
+    max_buffer_seconds: float = MAX_BUFFER_SECONDS
+
 # Store active WebSocket connections and their services
-active_connections: Dict[str, Dict[str, Any]] = {}
+active_connections: Dict[int, ConnectionRecord] = {}
+
+# Monotonic connection ids; unique even when connections are accepted in the same tick
+_conn_counter = itertools.count()
+
+# Below this size the FFI call into pybase64 costs more than the SIMD decode saves
+SIMD_B64_MIN_SIZE = 256
+
+# Binary frame layout (little-endian, 20 bytes):
+# [frame type:u8][channels:u8][sample format:u8][reserved:u8][sequence:u32][sample rate:u32][timestamp:f64]
+# followed by raw PCM for audio frames, or a JSON (msgpack if negotiated) body for control frames.
+# A zero timestamp means the client did not supply one and the receive time is used.
+FRAME_HEADER = struct.Struct('<BBBxIId')
+FRAME_TYPE_AUDIO = 0
+FRAME_TYPE_CONTROL = 1
+
+# PCM sample formats carried in audio frames
+SAMPLE_FORMAT_FLOAT32 = 0
+SAMPLE_FORMAT_INT16 = 1
+INT16_SCALE = np.float32(1.0 / 32768.0)
+
+# Clients offering this subprotocol exchange control messages as msgpack in binary frames
+MSGPACK_SUBPROTOCOL = "msgpack"
+
+def dumps(payload: Dict[str, Any]) -> str:
+    """Serialize an outbound message for a text frame (orjson, numpy-aware)"""
+    return orjson.dumps(payload, option=orjson.OPT_SERIALIZE_NUMPY).decode()
+
+def _msgpack_default(obj):
+    """Convert numpy values that msgpack cannot pack natively"""
+    if isinstance(obj, np.generic):
+        return obj.item()
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    raise TypeError(f"Cannot serialize {type(obj).__name__}")
+
+def queue_message(conn: ConnectionRecord, payload: Dict[str, Any]):
+    """Queue an outbound message for the connection's writer task"""
+    conn.outbox.put_nowait(payload)
+
+def encode_frame(conn: ConnectionRecord, payload: Dict[str, Any]):
+    """Serialize a message in the connection's negotiated encoding (bytes or str)"""
+    if conn.use_msgpack:
+        return msgpack.packb(payload, use_bin_type=True, default=_msgpack_default)
+    return dumps(payload)
+
+async def send_encoded(conn: ConnectionRecord, frame):
+    """Send an already serialized frame"""
+    if isinstance(frame, bytes):
+        await conn.websocket.send_bytes(frame)
+    else:
+        await conn.websocket.send_text(frame)
+
+async def send_frame(conn: ConnectionRecord, payload: Dict[str, Any]):
+    """Send a message in the connection's negotiated encoding"""
+    await send_encoded(conn, encode_frame(conn, payload))
+
+def broadcast(payload: Dict[str, Any]):
+    """Queue a message for every connection, serializing it once per encoding"""
+    frames = {}
+    for conn in list(active_connections.values()):
+        frame = frames.get(conn.use_msgpack)
+        if frame is None:
+            frame = frames[conn.use_msgpack] = encode_frame(conn, payload)
+        conn.outbox.put_nowait(frame)
+
+def set_tcp_nodelay(websocket: WebSocket):
+    """Disable Nagle on the connection's socket so small replies aren't held back
+    
+    Trades packet aggregation for latency. The ASGI interface doesn't expose the
+    transport, so this reaches it through the server's receive callable and does
+    nothing when that isn't available (e.g. under the test client).
+    """
+    transport = getattr(getattr(websocket._receive, "__self__", None), "transport", None)
+    sock = transport.get_extra_info("socket") if transport is not None else None
+    if sock is None or sock.family not in (socket.AF_INET, socket.AF_INET6):
+        return
+    try:
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    except OSError as e:
+        logger.debug("Could not set TCP_NODELAY: %s", e)
+
+def load_control_frame(conn: ConnectionRecord, body: memoryview) -> Dict[str, Any]:
+    """Parse the body of a binary control frame"""
+    if conn.use_msgpack:
+        return msgpack.unpackb(body, raw=False, use_list=False)
+    return orjson.loads(body)
+
+def decode_audio_data(audio_data_b64) -> bytes:
+    """Decode base64 audio, using the SIMD decoder for non-trivial payloads
+    
+    Payloads are expected in the standard padded alphabet (btoa() on the extension
+    side). Strings are encoded to ASCII once so both decoders take their bytes fast
+    path; malformed input raises ValueError (binascii.Error / UnicodeEncodeError).
+    """
+    if isinstance(audio_data_b64, str):
+        audio_data_b64 = audio_data_b64.encode('ascii')
+    if pybase64 is None or len(audio_data_b64) < SIMD_B64_MIN_SIZE:
+        return base64.b64decode(audio_data_b64)
+    return pybase64.b64decode(audio_data_b64, validate=False)
+
+# System stats are sampled at most once per SYS_STATS_TTL seconds
+SYS_STATS_TTL = 1.0
+_sys_stats_cache: Dict[str, Any] = {"t": 0.0, "val": None}
+
+def get_sys_stats() -> Dict[str, Any]:
+    """Return CPU/memory/disk usage, cached so polling clients don't hit /proc on every call"""
+    now = time.monotonic()
+    if _sys_stats_cache["val"] is None or now - _sys_stats_cache["t"] > SYS_STATS_TTL:
+        _sys_stats_cache["val"] = {
+            "cpu_percent": psutil.cpu_percent(interval=None),
+            "memory_percent": psutil.virtual_memory().percent,
+            "disk_usage": psutil.disk_usage('/').percent
+        }
+        _sys_stats_cache["t"] = now
+    return _sys_stats_cache["val"]
+
+@app.on_event("startup")
+async def log_event_loop():
+    """Log the event loop implementation serving requests (expect uvloop.Loop)"""
+    logger.info("Event loop: %s", asyncio.get_running_loop().__class__)
+
+@app.on_event("startup")
+async def compile_audio_kernels():
+    """JIT-compile the analysis kernels at startup rather than on the first live chunk"""
+    await asyncio.get_running_loop().run_in_executor(analysis_executor, warm_up_kernels)
+
+# Window over which chunk acknowledgments are coalesced into one frame (seconds)
+ACK_FLUSH_INTERVAL = 0.02
+
+# Constant parts of per-chunk acknowledgments; only the sequence number varies
+ACK_SUCCESS = {"status": "success"}
+ACK_FAILED = {"status": "failed", "message": "Failed to process audio chunk"}
+
+# Static response bodies, serialized once at import
+ROOT_RESPONSE = orjson.dumps({
+    "message": "TrueTone API is running",
+    "version": "1.0.0",
+    "features": [
+        "Real-time audio capture from YouTube",
+        "Efficient audio streaming with compression",
+        "Adaptive quality management",
+        "Network condition monitoring",
+        "Audio format conversion and optimization"
+    ],
+    "endpoints": {
+        "health": "/health",
+        "websocket": "/ws",
+        "status": "/status",
+        "connection_stats": "/stats/{connection_id}"
+    }
+})
+
+HEALTH_STATIC = {
+    "status": "healthy",
+    "service": "TrueTone Backend",
+    "version": "1.0.0",
+    "services_status": {
+        "audio_capture": "ready",
+        "audio_streaming": "ready",
+        "compression": "ready"
+    }
+}
+
+WELCOME_STATIC = {
+    "type": "connection_established",
+    "message": "Connected to TrueTone backend",
+    "features": {
+        "audio_capture": True,
+        "audio_streaming": True,
+        "compression": True,
+        "quality_monitoring": True,
+        "adaptive_buffering": True
+    }
+}
+
+STATUS_STATIC = {
+    "services_status": {
+        "audio_capture": "operational",
+        "audio_streaming": "operational",
+        "compression": "operational"
+    },
+    "version": "1.0.0"
+}
 
 @app.get("/")
 async def root():
     """Root endpoint - API information"""
-    return {
-        "message": "TrueTone API is running",
-        "version": "1.0.0",
-        "features": [
-            "Real-time audio capture from YouTube",
-            "Efficient audio streaming with compression",
-            "Adaptive quality management",
-            "Network condition monitoring",
-            "Audio format conversion and optimization"
-        ],
-        "endpoints": {
-            "health": "/health",
-            "websocket": "/ws",
-            "status": "/status",
-            "connection_stats": "/stats/{connection_id}"
-        }
-    }
+    return Response(content=ROOT_RESPONSE, media_type="application/json")
 
-@app.get("/health")
+@app.get("/health", response_class=ORJSONResponse)
 async def health_check():
     """Health check endpoint for the Chrome extension"""
-    return {
-        "status": "healthy",
-        "service": "TrueTone Backend",
-        "version": "1.0.0",
+    return ORJSONResponse({
+        **HEALTH_STATIC,
         "timestamp": time.time(),
-        "active_connections": len(active_connections),
-        "services_status": {
-            "audio_capture": "ready",
-            "audio_streaming": "ready",
-            "compression": "ready"
-        }
-    }
+        "active_connections": len(active_connections)
+    })
 
 @app.websocket("/ws")
 async def websocket_endpoint(websocket: WebSocket):
     """Enhanced WebSocket endpoint for real-time audio streaming"""
-    await websocket.accept()
-    connection_id = f"conn_{len(active_connections)}_{int(time.time())}"
+    # Negotiate msgpack control messages when the client offers it; JSON otherwise
+    use_msgpack = msgpack is not None and MSGPACK_SUBPROTOCOL in websocket.scope.get("subprotocols", [])
+    await websocket.accept(subprotocol=MSGPACK_SUBPROTOCOL if use_msgpack else None)
+    set_tcp_nodelay(websocket)
+    connection_id = next(_conn_counter)
     
     # Initialize services for this connection
     audio_capture = AudioCaptureService()
     audio_streaming = AudioStreamingService()
     
     # Store connection and services
-    active_connections[connection_id] = {
-        'websocket': websocket,
-        'audio_capture': audio_capture,
-        'audio_streaming': audio_streaming,
-        'connected_at': time.time(),
-        'last_activity': time.time()
-    }
+    now = time.time()
+    conn = ConnectionRecord(
+        websocket=websocket,
+        audio_capture=audio_capture,
+        audio_streaming=audio_streaming,
+        connected_at=now,
+        last_activity=now,
+        use_msgpack=use_msgpack
+    )
+    active_connections[connection_id] = conn
+    conn.processor_task = asyncio.create_task(chunk_processor(conn))
+    conn.writer_task = asyncio.create_task(drain_writer(conn))
     
-    logger.info(f"New WebSocket connection: {connection_id}")
+    logger.info("New WebSocket connection: %s", connection_id)
     
     try:
         # Send welcome message with connection info
-        await websocket.send_text(json.dumps({
-            "type": "connection_established",
-            "message": "Connected to TrueTone backend",
+        queue_message(conn, {
+            **WELCOME_STATIC,
             "connection_id": connection_id,
-            "server_time": time.time(),
-            "features": {
-                "audio_capture": True,
-                "audio_streaming": True,
-                "compression": True,
-                "quality_monitoring": True,
-                "adaptive_buffering": True
-            }
-        }))
+            "server_time": now
+        })
         
         # Set up streaming service with WebSocket
         audio_streaming.set_websocket(websocket)
         
         while True:
             # Receive data from client
-            data = await websocket.receive_text()
-            message = json.loads(data)
+            frame = await websocket.receive()
+            if frame["type"] == "websocket.disconnect":
+                raise WebSocketDisconnect(frame.get("code", 1000))
+            
+            # One clock read per message, shared by everything handled in this iteration
+            now = time.time()
+            conn.last_activity = now
             
-            # Update last activity
-            active_connections[connection_id]['last_activity'] = time.time()
+            # The ASGI server hands over each frame as a fresh immutable bytes object (there
+            # is no receive-into-buffer API), so frames are never copied after this point:
+            # audio is consumed through memoryviews of the payload and np.frombuffer
+            payload = frame.get("bytes")
+            if payload is not None:
+                if not payload:
+                    continue
+                if payload[0] == FRAME_TYPE_AUDIO:
+                    enqueue_chunk(conn, handle_binary_audio_chunk, payload)
+                    continue
+                message = load_control_frame(conn, memoryview(payload)[FRAME_HEADER.size:])
+            else:
+                message = orjson.loads(frame["text"])
             
             message_type = message.get('type')
-            logger.debug(f"[{connection_id}] Received message type: {message_type}")
+            logger.debug("[%s] Received message type: %s", connection_id, message_type)
             
             if message_type == "audio_chunk":
-                await handle_audio_chunk(websocket, message, audio_capture, audio_streaming)
-            elif message_type == "audio_config":
-                await handle_audio_config(websocket, message, audio_capture)
-            elif message_type == "stream_control":
-                await handle_stream_control(websocket, message, audio_capture, audio_streaming)
-            elif message_type == "quality_check":
-                await handle_quality_check(websocket, message, audio_capture)
-            elif message_type == "sync_request":
-                await handle_sync_request(websocket, message, audio_streaming)
-            elif message_type == "stats_request":
-                await handle_stats_request(websocket, message, audio_capture, audio_streaming)
+                enqueue_chunk(conn, handle_audio_chunk, message)
+                continue
+            
+            handler = _HANDLERS.get(message_type)
+            if handler is not None:
+                await handler(conn, message)
             else:
                 # Echo back unknown messages for debugging
-                await websocket.send_text(json.dumps({
+                queue_message(conn, {
                     "type": "echo",
                     "original": message,
-                    "server_time": time.time()
-                }))
+                    "server_time": now
+                })
                 
     except WebSocketDisconnect:
-        logger.info(f"WebSocket disconnected: {connection_id}")
-        await cleanup_connection(connection_id)
+        logger.info("WebSocket disconnected: %s", connection_id)
     except Exception as e:
-        logger.error(f"WebSocket error [{connection_id}]: {e}")
+        logger.error("WebSocket error [%s]: %s", connection_id, e)
+    finally:
+        # Runs on every exit path, including cancellation at server shutdown
         await cleanup_connection(connection_id)
 
-async def cleanup_connection(connection_id: str):
+async def cleanup_connection(connection_id: int):
     """Clean up connection and associated services"""
-    if connection_id in active_connections:
+    # Unregister first so a failure while stopping services can't leak the entry
+    conn = active_connections.pop(connection_id, None)
+    if conn is not None:
         try:
-            connection_info = active_connections[connection_id]
-            audio_capture = connection_info['audio_capture']
-            audio_streaming = connection_info['audio_streaming']
+            if conn.processor_task:
+                conn.processor_task.cancel()
+            if conn.writer_task:
+                conn.writer_task.cancel()
+            if conn.ack_flush_task:
+                conn.ack_flush_task.cancel()
             
             # Stop services
-            await audio_capture.stop_capture()
-            audio_streaming.stop_streaming()
-            
-            # Remove connection
-            del active_connections[connection_id]
-            logger.info(f"Cleaned up connection: {connection_id}")
+            await conn.audio_capture.stop_capture()
+            conn.audio_streaming.stop_streaming()
+            await conn.audio_streaming.drain_callbacks()
+            logger.info("Cleaned up connection: %s", connection_id)
             
         except Exception as e:
-            logger.error(f"Error cleaning up connection {connection_id}: {e}")
+            logger.error("Error cleaning up connection %s: %s", connection_id, e)
+
+async def send_batch(conn: ConnectionRecord, messages: List[Dict[str, Any]]):
+    """Send queued messages as a single frame"""
+    payload = messages[0] if len(messages) == 1 else {"type": "batch", "items": messages}
+    await send_frame(conn, payload)
+
+async def drain_writer(conn: ConnectionRecord):
+    """Send queued messages, collapsing everything already waiting into one batch frame
+    
+    Pre-serialized frames from broadcast() are sent as-is, after the messages
+    queued ahead of them, so ordering is preserved.
+    """
+    outbox = conn.outbox
+    while True:
+        batch = [await outbox.get()]
+        while not outbox.empty():
+            batch.append(outbox.get_nowait())
+        
+        messages = []
+        try:
+            for item in batch:
+                if isinstance(item, dict):
+                    messages.append(item)
+                    continue
+                if messages:
+                    await send_batch(conn, messages)
+                    messages = []
+                await send_encoded(conn, item)
+            if messages:
+                await send_batch(conn, messages)
+        except Exception as e:
+            logger.error("Error sending to client: %s", e)
+
+def enqueue_chunk(conn: ConnectionRecord, handler, item):
+    """Hand an audio chunk to the connection's processor, dropping the oldest if backed up"""
+    queue = conn.chunk_queue
+    if queue.full():
+        queue.get_nowait()
+        queue.task_done()
+        conn.dropped_chunks += 1
+        if conn.dropped_chunks % CHUNK_QUEUE_SIZE == 1:
+            logger.warning("Chunk queue full, dropped %s chunks so far", conn.dropped_chunks)
+    queue.put_nowait((handler, item))
+
+async def chunk_processor(conn: ConnectionRecord):
+    """Process queued audio chunks in FIFO order, decoupled from the receive loop"""
+    queue = conn.chunk_queue
+    while True:
+        handler, item = await queue.get()
+        try:
+            await handler(conn, item)
+        except Exception as e:
+            logger.error("Error in chunk processor: %s", e)
+        finally:
+            queue.task_done()
 
-async def handle_audio_chunk(websocket: WebSocket, message: Dict[str, Any], 
-                           audio_capture: AudioCaptureService, 
-                           audio_streaming: AudioStreamingService):
+async def handle_audio_chunk(conn: ConnectionRecord, message: Dict[str, Any]):
     """Handle incoming audio chunk from client"""
     try:
         # Extract audio data
         audio_data_b64 = message.get("data", "")
         if not audio_data_b64:
-            await websocket.send_text(json.dumps({
+            queue_message(conn, {
                 "type": "error",
                 "message": "No audio data provided"
-            }))
+            })
             return
         
         # Decode base64 audio data
         try:
-            audio_data = base64.b64decode(audio_data_b64)
-        except Exception as e:
-            await websocket.send_text(json.dumps({
+            audio_data = decode_audio_data(audio_data_b64)
+        except ValueError as e:
+            queue_message(conn, {
                 "type": "error",
                 "message": f"Invalid audio data encoding: {str(e)}"
-            }))
+            })
             return
         
         # Extract metadata
-        metadata = {
-            'sample_rate': message.get('sampleRate', 16000),
-            'channels': message.get('channels', 1),
-            'timestamp': message.get('timestamp', time.time()),
-            'sequence': message.get('sequence', 0),
-            'chunk_size': len(audio_data)
-        }
+        metadata = conn.chunk_metadata
+        metadata['sample_rate'] = message.get('sampleRate', 16000)
+        metadata['channels'] = message.get('channels', 1)
+        metadata['timestamp'] = message.get('timestamp') or conn.last_activity
+        metadata['sequence'] = message.get('sequence', 0)
+        metadata['chunk_size'] = len(audio_data)
         
-        # Process through audio capture service
-        success = await audio_capture.process_audio_chunk(audio_data, metadata)
-        
-        if success:
-            # Get buffer statistics
-            buffer_stats = audio_capture.get_buffer_stats()
-            
-            # Convert numpy types to Python types for JSON serialization
-            def convert_numpy_types(obj):
-                if isinstance(obj, dict):
-                    return {k: convert_numpy_types(v) for k, v in obj.items()}
-                elif isinstance(obj, list):
-                    return [convert_numpy_types(v) for v in obj]
-                elif hasattr(obj, 'item'):  # numpy scalar
-                    return obj.item()
-                elif hasattr(obj, 'tolist'):  # numpy array
-                    return obj.tolist()
-                else:
-                    return obj
-            
-            buffer_stats = convert_numpy_types(buffer_stats)
-            
-            # Send acknowledgment with buffer status
-            await websocket.send_text(json.dumps({
-                "type": "audio_chunk_processed",
-                "status": "success",
-                "sequence": metadata['sequence'],
-                "buffer_stats": buffer_stats,
-                "server_time": time.time()
-            }))
-        else:
-            await websocket.send_text(json.dumps({
-                "type": "audio_chunk_processed",
-                "status": "failed",
-                "sequence": metadata['sequence'],
-                "message": "Failed to process audio chunk"
-            }))
+        await process_audio_data(conn, audio_data, metadata)
             
     except Exception as e:
-        logger.error(f"Error handling audio chunk: {e}")
-        await websocket.send_text(json.dumps({
+        logger.error("Error handling audio chunk: %s", e)
+        queue_message(conn, {
+            "type": "error",
+            "message": f"Audio chunk processing error: {str(e)}"
+        })
+
+async def handle_binary_audio_chunk(conn: ConnectionRecord, payload: bytes):
+    """Handle a binary audio frame (raw PCM, no base64 or JSON)"""
+    try:
+        if len(payload) <= FRAME_HEADER.size:
+            queue_message(conn, {
+                "type": "error",
+                "message": "No audio data provided"
+            })
+            return
+        
+        _, channels, sample_format, sequence, sample_rate, timestamp = FRAME_HEADER.unpack_from(payload)
+        # Zero-copy view of the PCM body; the frame bytes are immutable and outlive processing
+        audio_data = memoryview(payload)[FRAME_HEADER.size:]
+        
+        if sample_format == SAMPLE_FORMAT_INT16:
+            # Capture pipeline works in float32; widen 16-bit PCM once at ingress
+            audio_data = int16_to_float32(conn, audio_data)
+        elif sample_format != SAMPLE_FORMAT_FLOAT32:
+            queue_message(conn, {
+                "type": "error",
+                "message": f"Unsupported sample format: {sample_format}"
+            })
+            return
+        
+        metadata = conn.chunk_metadata
+        metadata['sample_rate'] = sample_rate
+        metadata['channels'] = channels
+        metadata['timestamp'] = timestamp or conn.last_activity
+        metadata['sequence'] = sequence
+        metadata['chunk_size'] = len(audio_data)
+        
+        await process_audio_data(conn, audio_data, metadata)
+        
+    except Exception as e:
+        logger.error("Error handling binary audio chunk: %s", e)
+        queue_message(conn, {
             "type": "error",
             "message": f"Audio chunk processing error: {str(e)}"
-        }))
+        })
+
+def int16_to_float32(conn: ConnectionRecord, pcm: memoryview) -> memoryview:
+    """Widen 16-bit PCM to float32 in one pass into the connection's scratch buffer
+    
+    The result is only valid until the next chunk on this connection is converted.
+    """
+    src = np.frombuffer(pcm, dtype='<i2')
+    if conn.pcm_scratch.shape[0] < src.shape[0]:
+        conn.pcm_scratch = np.empty(src.shape[0], dtype=np.float32)
+    out = conn.pcm_scratch[:src.shape[0]]
+    np.multiply(src, INT16_SCALE, out=out)
+    return out.data.cast('B')
+
+async def process_audio_data(conn: ConnectionRecord, audio_data: bytes, metadata: Dict[str, Any]):
+    """Run a decoded audio chunk through the capture service and queue its acknowledgment"""
+    # Cap buffered audio at a fixed window of this stream's format so memory and
+    # downstream cost stay bounded; a header with a non-positive rate is ignored
+    sample_rate = metadata['sample_rate']
+    if conn.audio_capture.set_buffer_window(conn.max_buffer_seconds, sample_rate, metadata['channels']):
+        conn.sample_rate = sample_rate
+    
+    # Process through audio capture service
+    success = await conn.audio_capture.process_audio_chunk(audio_data, metadata)
+    
+    queue_ack(conn, {"sequence": metadata['sequence'], **(ACK_SUCCESS if success else ACK_FAILED)})
+
+def queue_ack(conn: ConnectionRecord, ack: Dict[str, Any]):
+    """Queue a chunk acknowledgment, scheduling a flush if none is pending"""
+    conn.ack_queue.append(ack)
+    if conn.ack_flush_task is None:
+        conn.ack_flush_task = asyncio.create_task(flush_acks(conn))
 
-async def handle_audio_config(websocket: WebSocket, message: Dict[str, Any], 
-                            audio_capture: AudioCaptureService):
+async def flush_acks(conn: ConnectionRecord):
+    """Send all acknowledgments queued during the flush window as one frame"""
+    await asyncio.sleep(ACK_FLUSH_INTERVAL)
+    # Don't pile acks onto a client that isn't draining its outbox; the bounded
+    # ack queue drops the oldest ones meanwhile
+    while conn.outbox.qsize() >= OUTBOX_BACKLOG_LIMIT:
+        await asyncio.sleep(ACK_FLUSH_INTERVAL)
+    batch = list(conn.ack_queue)
+    conn.ack_queue.clear()
+    conn.ack_flush_task = None
+    
+    if len(batch) == 1:
+        response = {"type": "audio_chunk_processed", **batch[0]}
+    else:
+        response = {"type": "audio_chunk_acks", "items": batch}
+    
+    # Buffer statistics are only needed once per flush, not once per chunk
+    response["buffer_stats"] = conn.audio_capture.get_buffer_stats()
+    response["server_time"] = time.time()
+    
+    queue_message(conn, response)
+
+async def handle_audio_config(conn: ConnectionRecord, message: Dict[str, Any]):
     """Handle audio configuration updates"""
+    audio_capture = conn.audio_capture
     try:
         config = message.get("config", {})
         
@@ -277,19 +615,18 @@ async def handle_audio_config(websocket: WebSocket, message: Dict[str, Any],
             "server_time": time.time()
         }
         
-        await websocket.send_text(json.dumps(response))
+        queue_message(conn, response)
         
     except Exception as e:
-        logger.error(f"Error handling audio config: {e}")
-        await websocket.send_text(json.dumps({
+        logger.error("Error handling audio config: %s", e)
+        queue_message(conn, {
             "type": "error",
             "message": f"Audio config error: {str(e)}"
-        }))
+        })
 
-async def handle_stream_control(websocket: WebSocket, message: Dict[str, Any],
-                              audio_capture: AudioCaptureService,
-                              audio_streaming: AudioStreamingService):
+async def handle_stream_control(conn: ConnectionRecord, message: Dict[str, Any]):
     """Handle stream control commands"""
+    audio_streaming = conn.audio_streaming
     try:
         command = message.get("command", "")
         
@@ -308,23 +645,23 @@ async def handle_stream_control(websocket: WebSocket, message: Dict[str, Any],
         else:
             status = "unknown_command"
         
-        await websocket.send_text(json.dumps({
+        queue_message(conn, {
             "type": "stream_control_response",
             "command": command,
             "status": status,
             "server_time": time.time()
-        }))
+        })
         
     except Exception as e:
-        logger.error(f"Error handling stream control: {e}")
-        await websocket.send_text(json.dumps({
+        logger.error("Error handling stream control: %s", e)
+        queue_message(conn, {
             "type": "error",
             "message": f"Stream control error: {str(e)}"
-        }))
+        })
 
-async def handle_quality_check(websocket: WebSocket, message: Dict[str, Any],
-                             audio_capture: AudioCaptureService):
+async def handle_quality_check(conn: ConnectionRecord, message: Dict[str, Any]):
     """Handle audio quality check requests"""
+    audio_capture = conn.audio_capture
     try:
         # Get current quality metrics and recommendations
         quality_info = audio_capture.quality_monitor.get_recommendations()
@@ -338,21 +675,21 @@ async def handle_quality_check(websocket: WebSocket, message: Dict[str, Any],
             "server_time": time.time()
         }
         
-        await websocket.send_text(json.dumps(response))
+        queue_message(conn, response)
         
     except Exception as e:
-        logger.error(f"Error handling quality check: {e}")
-        await websocket.send_text(json.dumps({
+        logger.error("Error handling quality check: %s", e)
+        queue_message(conn, {
             "type": "error",
             "message": f"Quality check error: {str(e)}"
-        }))
+        })
 
-async def handle_sync_request(websocket: WebSocket, message: Dict[str, Any],
-                            audio_streaming: AudioStreamingService):
+async def handle_sync_request(conn: ConnectionRecord, message: Dict[str, Any]):
     """Handle clock synchronization requests"""
+    audio_streaming = conn.audio_streaming
     try:
-        client_timestamp = message.get("client_time", time.time())
         server_timestamp = time.time()
+        client_timestamp = message.get("client_time", server_timestamp)
         
         # Update synchronizer
         audio_streaming.synchronizer.sync_clocks(client_timestamp, server_timestamp)
@@ -365,19 +702,18 @@ async def handle_sync_request(websocket: WebSocket, message: Dict[str, Any],
             "jitter_estimate": audio_streaming.synchronizer.estimate_jitter()
         }
         
-        await websocket.send_text(json.dumps(response))
+        queue_message(conn, response)
         
     except Exception as e:
-        logger.error(f"Error handling sync request: {e}")
-        await websocket.send_text(json.dumps({
+        logger.error("Error handling sync request: %s", e)
+        queue_message(conn, {
             "type": "error",
             "message": f"Sync request error: {str(e)}"
-        }))
+        })
 
-async def handle_stats_request(websocket: WebSocket, message: Dict[str, Any],
-                             audio_capture: AudioCaptureService,
-                             audio_streaming: AudioStreamingService):
+async def handle_stats_request(conn: ConnectionRecord, message: Dict[str, Any]):
     """Handle statistics requests"""
+    audio_capture, audio_streaming = conn.audio_capture, conn.audio_streaming
     try:
         stats_type = message.get("stats_type", "all")
         
@@ -394,83 +730,83 @@ async def handle_stats_request(websocket: WebSocket, message: Dict[str, Any],
             response["streaming_stats"] = audio_streaming.get_streaming_stats()
         
         if stats_type in ["all", "system"]:
-            import psutil
             response["system_stats"] = {
-                "cpu_percent": psutil.cpu_percent(),
-                "memory_percent": psutil.virtual_memory().percent,
+                **get_sys_stats(),
                 "connections": len(active_connections)
             }
         
-        await websocket.send_text(json.dumps(response))
+        queue_message(conn, response)
         
     except Exception as e:
-        logger.error(f"Error handling stats request: {e}")
-        await websocket.send_text(json.dumps({
+        logger.error("Error handling stats request: %s", e)
+        queue_message(conn, {
             "type": "error",
             "message": f"Stats request error: {str(e)}"
-        }))
+        })
+
+# Control message handlers by message type; audio chunks go through the chunk queue instead
+_HANDLERS = {
+    "audio_config": handle_audio_config,
+    "stream_control": handle_stream_control,
+    "quality_check": handle_quality_check,
+    "sync_request": handle_sync_request,
+    "stats_request": handle_stats_request
+}
 
-@app.get("/status")
+@app.get("/status", response_class=ORJSONResponse)
 async def get_status():
     """Get current system status"""
     try:
-        import psutil
-        system_stats = {
-            "cpu_percent": psutil.cpu_percent(),
-            "memory_percent": psutil.virtual_memory().percent,
-            "disk_usage": psutil.disk_usage('/').percent
-        }
-    except:
+        system_stats = get_sys_stats()
+    except Exception:
         system_stats = {"error": "System stats unavailable"}
     
-    connection_details = {}
-    for conn_id, conn_info in active_connections.items():
-        connection_details[conn_id] = {
-            "connected_at": conn_info.get('connected_at', 0),
-            "last_activity": conn_info.get('last_activity', 0),
-            "duration": time.time() - conn_info.get('connected_at', time.time())
+    now = time.time()
+    connection_details = {
+        conn_id: {
+            "connected_at": conn.connected_at,
+            "last_activity": conn.last_activity,
+            "duration": now - conn.connected_at
         }
+        for conn_id, conn in list(active_connections.items())
+    }
     
-    return {
+    return ORJSONResponse({
         "active_connections": len(active_connections),
         "connection_details": connection_details,
         "system_stats": system_stats,
-        "services_status": {
-            "audio_capture": "operational",
-            "audio_streaming": "operational", 
-            "compression": "operational"
-        },
-        "uptime": time.time(),
-        "version": "1.0.0"
-    }
+        **STATUS_STATIC,
+        "uptime": now
+    })
 
-@app.get("/stats/{connection_id}")
-async def get_connection_stats(connection_id: str):
+@app.get("/stats/{connection_id}", response_class=ORJSONResponse)
+async def get_connection_stats(connection_id: int):
     """Get detailed statistics for a specific connection"""
     if connection_id not in active_connections:
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=404,
             content={"error": f"Connection {connection_id} not found"}
         )
     
     try:
-        conn_info = active_connections[connection_id]
-        audio_capture = conn_info['audio_capture']
-        audio_streaming = conn_info['audio_streaming']
+        conn = active_connections[connection_id]
+        now = time.time()
         
-        return {
+        return ORJSONResponse({
             "connection_id": connection_id,
             "connection_info": {
-                "connected_at": conn_info.get('connected_at', 0),
-                "last_activity": conn_info.get('last_activity', 0),
-                "duration": time.time() - conn_info.get('connected_at', time.time())
+                "connected_at": conn.connected_at,
+                "last_activity": conn.last_activity,
+                "duration": now - conn.connected_at,
+                "queued_chunks": conn.chunk_queue.qsize(),
+                "dropped_chunks": conn.dropped_chunks
             },
-            "capture_stats": audio_capture.get_buffer_stats(),
-            "streaming_stats": audio_streaming.get_streaming_stats(),
-            "timestamp": time.time()
-        }
+            "capture_stats": conn.audio_capture.get_buffer_stats(),
+            "streaming_stats": conn.audio_streaming.get_streaming_stats(),
+            "timestamp": now
+        })
     except Exception as e:
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=500,
             content={"error": f"Failed to get stats: {str(e)}"}
         )
@@ -482,5 +818,10 @@ if __name__ == "__main__":
         host="0.0.0.0",
         port=8000,
         reload=True,
+        loop="uvloop",
+        http="httptools",
+        ws="websockets",
+        # Stats/ack JSON repeats the same keys every frame and deflates well
+        ws_per_message_deflate=True,
         log_level="info"
     )
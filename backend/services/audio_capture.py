@@ -6,77 +6,243 @@ Handles audio capture, buffering, and quality management
 
 import asyncio
 import logging
+import math
+import os
 import time
-from typing import Dict, Optional, Callable, Any
+from functools import lru_cache
+from math import gcd
+from typing import Dict, List, Optional, Callable, Any, Tuple
 import numpy as np
 import soundfile as sf
 import librosa
-from collections import deque
 import threading
+import weakref
 import psutil
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import soxr
+except ImportError:
+    soxr = None
+
+try:
+    from scipy.signal import firwin, resample_poly
+except ImportError:
+    resample_poly = None
+
+from utils.audio_kernels import downmix, scrub_normalize
 
 logger = logging.getLogger(__name__)
 
+# Incoming PCM is float32
+BYTES_PER_SAMPLE = 4
+
+# Chunks whose peak stays below this level are treated as silence and skip analysis
+SILENCE_THRESHOLD = 1e-4
+
+# Noise floor: exponentially weighted median absolute deviation across chunks, each
+# chunk's median taken over at most NOISE_FLOOR_SAMPLES evenly strided samples
+NOISE_FLOOR_SAMPLES = 4096
+NOISE_FLOOR_ALPHA = 0.05
+MAD_TO_SIGMA = 1.4826
+
+# Sustained overflow happens on every chunk once the buffer is full, so only one
+# in this many overflow events is logged
+OVERFLOW_LOG_INTERVAL = 100
+
+# Shared pool for CPU-bound chunk analysis; numpy/librosa release the GIL in their
+# kernels, so threads keep the event loop free without pickling audio across processes
+analysis_executor = ThreadPoolExecutor(max_workers=os.cpu_count(), thread_name_prefix="audio-analysis")
+
+# Seconds between system load samples taken by the shared health monitor
+HEALTH_CHECK_INTERVAL = 5.0
+
+# /proc files re-read by health monitoring, opened once per process (Linux only;
+# other platforms fall back to psutil)
+_PROC_AVAILABLE = os.path.exists('/proc/stat') and os.path.exists('/proc/meminfo')
+_proc_fds: Dict[str, int] = {}
+
+def _read_proc(path: str) -> bytes:
+    """Re-read a /proc file from offset 0 through a cached descriptor"""
+    fd = _proc_fds.get(path)
+    if fd is None:
+        fd = _proc_fds[path] = os.open(path, os.O_RDONLY)
+    return os.pread(fd, 4096, 0)
+
+def _memory_percent() -> float:
+    """Used memory as a percentage of total, as psutil.virtual_memory().percent"""
+    total = available = None
+    for line in _read_proc('/proc/meminfo').split(b'\n'):
+        if line.startswith(b'MemTotal:'):
+            total = int(line.split()[1])
+        elif line.startswith(b'MemAvailable:'):
+            available = int(line.split()[1])
+            break
+    return (total - available) / total * 100
+
+def _cpu_times() -> Tuple[int, int]:
+    """(busy, total) jiffies from the aggregate cpu line of /proc/stat"""
+    fields = _read_proc('/proc/stat').split(b'\n', 1)[0].split()
+    # user nice system idle iowait irq softirq steal; guest time is already in user
+    times = [int(v) for v in fields[1:9]]
+    total = sum(times)
+    return total - times[3] - times[4], total
+
+def _sample_load(cpu_prev: Optional[Tuple[int, int]]):
+    """(memory %, CPU % since cpu_prev, new cpu_prev) for the whole host"""
+    if not _PROC_AVAILABLE:
+        return psutil.virtual_memory().percent, psutil.cpu_percent(), None
+    
+    busy, total = _cpu_times()
+    cpu_percent = 0.0
+    if cpu_prev is not None and total > cpu_prev[1]:
+        cpu_percent = round((busy - cpu_prev[0]) / (total - cpu_prev[1]) * 100, 1)
+    return round(_memory_percent(), 1), cpu_percent, (busy, total)
+
+@lru_cache(maxsize=8)
+def _polyphase_filter(up: int, down: int) -> np.ndarray:
+    """Design resample_poly's default anti-aliasing FIR once per rate ratio"""
+    max_rate = max(up, down)
+    return firwin(20 * max_rate + 1, 1.0 / max_rate, window=('kaiser', 5.0)).astype(np.float32)
+
 class AudioBuffer:
-    """Circular buffer for continuous audio streaming with overflow protection"""
+    """Circular buffer for continuous audio streaming with overflow protection
+    
+    Backed by a preallocated byte array with head/size indices, so writes and
+    reads are at most two slice copies each; on overflow the oldest bytes are
+    overwritten.
+    
+    Writers, readers, overflow eviction and resizing all move the head, so they
+    serialize on the lock. Size and counter reads take no lock: each is a single
+    attribute load, and statistics only need a recent value.
+    """
     
     def __init__(self, max_size: int = 1024 * 1024):  # 1MB default
         self.max_size = max_size
-        self.buffer = deque(maxlen=max_size)
+        self._buf = np.empty(max_size, dtype=np.uint8)
+        self._head = 0  # index of the oldest byte
+        self._size = 0
         self.lock = threading.Lock()
         self.overflow_count = 0
+        self.overflow_events = 0
         self.total_written = 0
         self.total_read = 0
+    
+    def _drop(self, count: int):
+        """Discard the oldest count bytes (lock held)"""
+        self._head = (self._head + count) % self.max_size
+        self._size -= count
         
     def write(self, data: bytes) -> bool:
         """Write data to buffer with overflow protection"""
+        arr = np.frombuffer(data, dtype=np.uint8)
+        n = len(arr)
         with self.lock:
-            if len(self.buffer) + len(data) > self.max_size:
+            if self._size + n > self.max_size:
                 # Remove old data to make room
-                overflow_size = len(self.buffer) + len(data) - self.max_size
-                for _ in range(min(overflow_size, len(self.buffer))):
-                    self.buffer.popleft()
+                overflow_size = self._size + n - self.max_size
+                self._drop(min(overflow_size, self._size))
                 self.overflow_count += overflow_size
-                logger.warning(f"Audio buffer overflow: {overflow_size} bytes dropped")
+                self.overflow_events += 1
+                if self.overflow_events % OVERFLOW_LOG_INTERVAL == 1:
+                    logger.warning("Audio buffer overflow: %s bytes dropped (%s overflows, %s bytes total)",
+                                   overflow_size, self.overflow_events, self.overflow_count)
             
-            self.buffer.extend(data)
-            self.total_written += len(data)
+            self.total_written += n
+            if n > self.max_size:
+                # Only the newest max_size bytes of an oversized write survive
+                arr = arr[n - self.max_size:]
+                n = self.max_size
+            
+            tail = (self._head + self._size) % self.max_size
+            first = min(n, self.max_size - tail)
+            self._buf[tail:tail + first] = arr[:first]
+            self._buf[:n - first] = arr[first:]
+            self._size += n
             return True
     
     def read(self, size: int) -> bytes:
         """Read data from buffer"""
         with self.lock:
-            if len(self.buffer) < size:
-                # Return what we have
-                data = bytes(self.buffer)
-                self.buffer.clear()
-            else:
-                data = bytes([self.buffer.popleft() for _ in range(size)])
+            # Return what we have if fewer than size bytes are buffered
+            n = min(size, self._size)
+            head = self._head
+            first = min(n, self.max_size - head)
+            data = self._buf[head:head + first].tobytes()
+            if first < n:
+                data += self._buf[:n - first].tobytes()
+            self._drop(n)
             
-            self.total_read += len(data)
+            self.total_read += n
             return data
     
+    def read_into(self, dst) -> int:
+        """Move up to len(dst) of the oldest bytes into a writable buffer, returning the count
+        
+        Copies straight from the ring into the caller's memory (no intermediate bytes), so a
+        consumer can reuse one buffer and view it with np.frombuffer.
+        """
+        out = np.frombuffer(dst, dtype=np.uint8)
+        with self.lock:
+            n = min(out.shape[0], self._size)
+            head = self._head
+            first = min(n, self.max_size - head)
+            out[:first] = self._buf[head:head + first]
+            out[first:n] = self._buf[:n - first]
+            self._drop(n)
+            
+            self.total_read += n
+            return n
+    
+    def resize(self, max_size: int):
+        """Change the capacity, keeping the newest bytes that still fit"""
+        with self.lock:
+            keep = min(self._size, max_size)
+            buf = np.empty(max_size, dtype=np.uint8)
+            start = (self._head + self._size - keep) % self.max_size
+            first = min(keep, self.max_size - start)
+            buf[:first] = self._buf[start:start + first]
+            buf[first:keep] = self._buf[:keep - first]
+            self.overflow_count += self._size - keep
+            self._buf = buf
+            self.max_size = max_size
+            self._head = 0
+            self._size = keep
+    
     def available(self) -> int:
         """Get available bytes in buffer"""
-        with self.lock:
-            return len(self.buffer)
+        return self._size
     
     def clear(self):
         """Clear buffer"""
         with self.lock:
-            self.buffer.clear()
+            self._head = 0
+            self._size = 0
     
     def get_stats(self) -> Dict[str, int]:
         """Get buffer statistics"""
-        with self.lock:
-            return {
-                'size': len(self.buffer),
-                'max_size': self.max_size,
-                'overflow_count': self.overflow_count,
-                'total_written': self.total_written,
-                'total_read': self.total_read,
-                'utilization': len(self.buffer) / self.max_size * 100
-            }
+        size = self._size
+        return {
+            'size': size,
+            'max_size': self.max_size,
+            'overflow_count': self.overflow_count,
+            'total_written': self.total_written,
+            'total_read': self.total_read,
+            'utilization': size / self.max_size * 100
+        }
+
+# Quality issue flags set by detect_format, and the advice for every combination
+QUALITY_LOW_SNR = 1
+QUALITY_CLIPPING = 2
+QUALITY_LOW_DYNAMIC_RANGE = 4
+_QUALITY_MESSAGES = (
+    (QUALITY_LOW_SNR, "Low SNR detected - consider noise reduction"),
+    (QUALITY_CLIPPING, "Audio clipping detected - reduce input level"),
+    (QUALITY_LOW_DYNAMIC_RANGE, "Low dynamic range - check compression settings"),
+)
+_RECOMMENDATIONS = tuple(
+    tuple(message for flag, message in _QUALITY_MESSAGES if flags & flag) for flags in range(8)
+)
 
 class AudioQualityMonitor:
     """Monitor and optimize audio quality"""
@@ -86,7 +252,15 @@ class AudioQualityMonitor:
         self.channels = None
         self.bit_depth = None
         self.quality_metrics = {}
+        # No metrics yet reads as zero SNR and dynamic range
+        self.quality_flags = QUALITY_LOW_SNR | QUALITY_LOW_DYNAMIC_RANGE
         self.auto_adjustment_enabled = True
+        self._ewma_mad = None
+        # Reused for the noise-floor sample of every chunk, grown on demand
+        self._mad_scratch = np.empty(0, dtype=np.float32)
+        # Streaming resampler for mono chunks; keeps filter state across chunk boundaries
+        self._resampler = None
+        self._resampler_rates = None
         
     def detect_format(self, audio_data: np.ndarray, sample_rate: int) -> Dict[str, Any]:
         """Detect audio format and quality metrics"""
@@ -96,15 +270,40 @@ class AudioQualityMonitor:
         else:
             channels = audio_data.shape[1] if audio_data.shape[1] < audio_data.shape[0] else audio_data.shape[0]
         
-        # Calculate quality metrics
-        rms_level = np.sqrt(np.mean(audio_data**2))
-        peak_level = np.max(np.abs(audio_data))
+        # Peak via max/min reductions (no temporary); silent chunks skip the remaining passes
+        peak_level = max(audio_data.max(), -audio_data.min()) if audio_data.size else 0.0
+        if peak_level < SILENCE_THRESHOLD:
+            self.quality_metrics = {
+                'sample_rate': sample_rate,
+                'channels': channels,
+                'rms_level': 0.0,
+                'peak_level': float(peak_level),
+                'dynamic_range': 0.0,
+                'snr_estimate': 0.0,
+                'clipping_detected': False,
+                'is_silent': True
+            }
+            # Silence has no meaningful SNR or dynamic range to advise on
+            self.quality_flags = 0
+            return self.quality_metrics
+        
+        # Calculate quality metrics; the sum of squares is a BLAS dot product, which
+        # writes no temporary
+        flat = audio_data.reshape(-1)
+        signal_power = float(np.dot(flat, flat)) / flat.size
+        rms_level = math.sqrt(signal_power)
         dynamic_range = 20 * np.log10(peak_level / (rms_level + 1e-10))
         
-        # Estimate SNR (simplified)
-        signal_power = np.mean(audio_data**2)
-        noise_floor = np.percentile(audio_data**2, 10)  # Estimate noise floor
+        # Estimate SNR (simplified) against a rolling MAD noise floor
+        noise_floor = (MAD_TO_SIGMA * self._update_mad(flat)) ** 2
         snr = 10 * np.log10(signal_power / (noise_floor + 1e-10))
+        clipping = peak_level >= 0.99
+        
+        self.quality_flags = (
+            (QUALITY_LOW_SNR if snr < 10 else 0)
+            | (QUALITY_CLIPPING if clipping else 0)
+            | (QUALITY_LOW_DYNAMIC_RANGE if dynamic_range < 10 else 0)
+        )
         
         self.quality_metrics = {
             'sample_rate': sample_rate,
@@ -113,121 +312,176 @@ class AudioQualityMonitor:
             'peak_level': float(peak_level),
             'dynamic_range': float(dynamic_range),
             'snr_estimate': float(snr),
-            'clipping_detected': peak_level >= 0.99
+            'clipping_detected': bool(clipping),
+            'is_silent': False
         }
         
         return self.quality_metrics
     
+    def _update_mad(self, flat: np.ndarray) -> float:
+        """Fold this chunk's median absolute deviation into the running estimate"""
+        step = max(1, flat.size // NOISE_FLOOR_SAMPLES)
+        sample = flat[::step]
+        scratch = self._mad_scratch
+        if scratch.shape[0] < sample.shape[0] or scratch.dtype != sample.dtype:
+            scratch = self._mad_scratch = np.empty(sample.shape[0], dtype=sample.dtype)
+        # |x| into the scratch, then let the median partition it in place (no copies)
+        magnitudes = np.abs(sample, out=scratch[:sample.shape[0]])
+        mad = float(np.median(magnitudes, overwrite_input=True))
+        if not math.isfinite(mad):
+            # A chunk with NaN/Inf samples would poison the running floor for the rest
+            # of the stream; leave it as it was
+            return mad if self._ewma_mad is None else self._ewma_mad
+        if self._ewma_mad is None:
+            self._ewma_mad = mad
+        else:
+            self._ewma_mad += NOISE_FLOOR_ALPHA * (mad - self._ewma_mad)
+        return self._ewma_mad
+    
     def optimize_for_ml(self, audio_data: np.ndarray, current_sr: int, target_sr: int = 16000) -> np.ndarray:
         """Optimize audio for ML model processing"""
-        # Resample if needed
-        if current_sr != target_sr:
-            audio_data = librosa.resample(audio_data, orig_sr=current_sr, target_sr=target_sr)
+        source = audio_data
         
-        # Convert to mono if stereo
+        # Convert (frames, channels) to mono first: resampling is linear, so
+        # resampling the mix equals mixing the resampled channels, at 1/channels the work
         if len(audio_data.shape) > 1:
-            audio_data = librosa.to_mono(audio_data.T)
+            audio_data = downmix(audio_data)
         
-        # Normalize audio
-        if np.max(np.abs(audio_data)) > 0:
-            audio_data = audio_data / np.max(np.abs(audio_data)) * 0.9
+        # Resample if needed
+        if current_sr != target_sr:
+            if soxr is None:
+                audio_data = self._poly_resample(audio_data, current_sr, target_sr)
+            else:
+                audio_data = self._stream_resample(audio_data, current_sr, target_sr)
         
-        return audio_data
+        # Peak-normalize to 0.9 with one level reduction and one fused scale pass,
+        # in place unless the array is still the caller's input
+        out = audio_data if audio_data is not source and audio_data.flags.writeable else None
+        return scrub_normalize(audio_data, 0.9, method='peak', out=out)
+    
+    def _stream_resample(self, audio_data: np.ndarray, current_sr: int, target_sr: int) -> np.ndarray:
+        """Resample one chunk of a continuous mono stream"""
+        rates = (current_sr, target_sr)
+        if self._resampler is None or self._resampler_rates != rates:
+            self._resampler = soxr.ResampleStream(current_sr, target_sr, 1, dtype='float32', quality='HQ')
+            self._resampler_rates = rates
+        return self._resampler.resample_chunk(audio_data.astype(np.float32, copy=False))
+    
+    def _poly_resample(self, audio_data: np.ndarray, current_sr: int, target_sr: int) -> np.ndarray:
+        """Polyphase resample with a cached filter, or librosa if scipy is missing"""
+        if resample_poly is None:
+            return librosa.resample(audio_data, orig_sr=current_sr, target_sr=target_sr)
+        g = gcd(int(current_sr), int(target_sr))
+        up, down = int(target_sr) // g, int(current_sr) // g
+        return resample_poly(audio_data, up, down, axis=-1, window=_polyphase_filter(up, down))
+    
+    def reset_resampler(self):
+        """Drop resampler state, e.g. when the stream stops"""
+        self._resampler = None
+        self._resampler_rates = None
     
     def get_recommendations(self) -> Dict[str, str]:
         """Get quality improvement recommendations"""
-        recommendations = []
-        
-        if self.quality_metrics.get('snr_estimate', 0) < 10:
-            recommendations.append("Low SNR detected - consider noise reduction")
-        
-        if self.quality_metrics.get('clipping_detected', False):
-            recommendations.append("Audio clipping detected - reduce input level")
-        
-        if self.quality_metrics.get('dynamic_range', 0) < 10:
-            recommendations.append("Low dynamic range - check compression settings")
-        
-        return {'recommendations': recommendations, 'metrics': self.quality_metrics}
+        return {'recommendations': _RECOMMENDATIONS[self.quality_flags], 'metrics': self.quality_metrics}
 
 class AudioStreamManager:
     """Manage audio streaming with health monitoring and reconnection"""
     
     def __init__(self, max_reconnect_attempts: int = 5):
         self.is_active = False
-        self.health_check_interval = 5.0  # seconds
         self.max_reconnect_attempts = max_reconnect_attempts
         self.reconnect_count = 0
         self.last_health_check = time.time()
+        # (callback, is_coroutine_function) pairs, classified once at registration
         self.stream_callbacks = []
         self.error_callbacks = []
-        self.health_monitor_task = None
         
     def add_stream_callback(self, callback: Callable):
         """Add callback for stream events"""
-        self.stream_callbacks.append(callback)
+        self.stream_callbacks.append((callback, asyncio.iscoroutinefunction(callback)))
     
     def add_error_callback(self, callback: Callable):
         """Add callback for error events"""
-        self.error_callbacks.append(callback)
+        self.error_callbacks.append((callback, asyncio.iscoroutinefunction(callback)))
+    
+    # One sampling task serves every manager that is monitoring health
+    _health_subscribers: "weakref.WeakSet[AudioStreamManager]" = weakref.WeakSet()
+    _shared_monitor_task: Optional[asyncio.Task] = None
     
     def start_health_monitoring(self):
-        """Start health monitoring task"""
-        if self.health_monitor_task is None:
-            self.health_monitor_task = asyncio.create_task(self._health_monitor_loop())
+        """Subscribe to the shared health monitor, starting it if needed"""
+        cls = AudioStreamManager
+        cls._health_subscribers.add(self)
+        task = cls._shared_monitor_task
+        if task is None or task.done() or task.get_loop() is not asyncio.get_running_loop():
+            cls._shared_monitor_task = asyncio.create_task(cls._health_monitor_loop())
     
     def stop_health_monitoring(self):
-        """Stop health monitoring task"""
-        if self.health_monitor_task:
-            self.health_monitor_task.cancel()
-            self.health_monitor_task = None
-    
-    async def _health_monitor_loop(self):
-        """Health monitoring loop"""
-        while self.is_active:
+        """Unsubscribe from the shared health monitor, stopping it with the last subscriber"""
+        cls = AudioStreamManager
+        cls._health_subscribers.discard(self)
+        if not cls._health_subscribers and cls._shared_monitor_task is not None:
+            cls._shared_monitor_task.cancel()
+            cls._shared_monitor_task = None
+    
+    @classmethod
+    async def _health_monitor_loop(cls):
+        """Sample system load once per interval and fan it out to all subscribers"""
+        cpu_prev = None
+        while cls._health_subscribers:
             try:
-                await asyncio.sleep(self.health_check_interval)
+                await asyncio.sleep(HEALTH_CHECK_INTERVAL)
                 
                 # Check system resources
-                memory_percent = psutil.virtual_memory().percent
-                cpu_percent = psutil.cpu_percent()
-                
+                memory_percent, cpu_percent, cpu_prev = _sample_load(cpu_prev)
                 if memory_percent > 90:
-                    logger.warning(f"High memory usage: {memory_percent}%")
-                    await self._notify_callbacks('memory_warning', {'usage': memory_percent})
-                
+                    logger.warning("High memory usage: %s%%", memory_percent)
                 if cpu_percent > 80:
-                    logger.warning(f"High CPU usage: {cpu_percent}%")
-                    await self._notify_callbacks('cpu_warning', {'usage': cpu_percent})
+                    logger.warning("High CPU usage: %s%%", cpu_percent)
                 
-                self.last_health_check = time.time()
+                for manager in list(cls._health_subscribers):
+                    await manager._on_health_sample(memory_percent, cpu_percent)
                 
             except asyncio.CancelledError:
                 break
             except Exception as e:
-                logger.error(f"Health monitor error: {e}")
-                await self._notify_error_callbacks('health_monitor_error', str(e))
+                logger.error("Health monitor error: %s", e)
+                for manager in list(cls._health_subscribers):
+                    await manager._notify_error_callbacks('health_monitor_error', str(e))
+    
+    async def _on_health_sample(self, memory_percent: float, cpu_percent: float):
+        """Raise resource warnings for this stream from a shared health sample"""
+        if memory_percent > 90:
+            await self._notify_callbacks('memory_warning', {'usage': memory_percent})
+        if cpu_percent > 80:
+            await self._notify_callbacks('cpu_warning', {'usage': cpu_percent})
+        self.last_health_check = time.time()
     
     async def _notify_callbacks(self, event_type: str, data: Dict[str, Any]):
         """Notify stream callbacks"""
-        for callback in self.stream_callbacks:
-            try:
-                if asyncio.iscoroutinefunction(callback):
-                    await callback(event_type, data)
-                else:
-                    callback(event_type, data)
-            except Exception as e:
-                logger.error(f"Callback error: {e}")
+        await self._dispatch(self.stream_callbacks, "Callback error", event_type, data)
     
     async def _notify_error_callbacks(self, error_type: str, error_message: str):
         """Notify error callbacks"""
-        for callback in self.error_callbacks:
+        await self._dispatch(self.error_callbacks, "Error callback error", error_type, error_message)
+    
+    @staticmethod
+    async def _dispatch(callbacks, error_label: str, *args):
+        """Call sync callbacks in order, then await coroutine callbacks concurrently"""
+        pending = []
+        for callback, is_coroutine in callbacks:
+            if is_coroutine:
+                pending.append(callback(*args))
+                continue
             try:
-                if asyncio.iscoroutinefunction(callback):
-                    await callback(error_type, error_message)
-                else:
-                    callback(error_type, error_message)
+                callback(*args)
             except Exception as e:
-                logger.error(f"Error callback error: {e}")
+                logger.error("%s: %s", error_label, e)
+        
+        if pending:
+            for result in await asyncio.gather(*pending, return_exceptions=True):
+                if isinstance(result, Exception):
+                    logger.error("%s: %s", error_label, result)
     
     def start_stream(self):
         """Start audio stream"""
@@ -243,36 +497,36 @@ class AudioStreamManager:
     
     async def handle_reconnection(self, error: Exception):
         """Handle stream reconnection with exponential backoff"""
-        if self.reconnect_count >= self.max_reconnect_attempts:
-            logger.error(f"Max reconnection attempts reached: {self.max_reconnect_attempts}")
-            await self._notify_error_callbacks('max_reconnects_reached', str(error))
-            return False
-        
-        # Exponential backoff
-        wait_time = min(2 ** self.reconnect_count, 30)  # Max 30 seconds
-        self.reconnect_count += 1
-        
-        logger.info(f"Attempting reconnection {self.reconnect_count}/{self.max_reconnect_attempts} in {wait_time}s")
-        await asyncio.sleep(wait_time)
-        
-        try:
-            # Attempt to restart stream
-            self.stop_stream()
-            await asyncio.sleep(1)
-            self.start_stream()
+        while self.reconnect_count < self.max_reconnect_attempts:
+            # Exponential backoff
+            wait_time = min(2 ** self.reconnect_count, 30)  # Max 30 seconds
+            self.reconnect_count += 1
+            
+            logger.info("Attempting reconnection %s/%s in %ss", self.reconnect_count, self.max_reconnect_attempts, wait_time)
+            await asyncio.sleep(wait_time)
+            
+            try:
+                # Attempt to restart stream
+                self.stop_stream()
+                await asyncio.sleep(1)
+                self.start_stream()
+            except Exception as reconnect_error:
+                logger.error("Reconnection failed: %s", reconnect_error)
+                await self._notify_error_callbacks('reconnection_failed', str(reconnect_error))
+                error = reconnect_error
+                continue
             
-            # Reset reconnect count on success
-            self.reconnect_count = 0
+            # Report the successful attempt, then reset the count
+            attempt, self.reconnect_count = self.reconnect_count, 0
             await self._notify_callbacks('reconnection_success', {
-                'attempt': self.reconnect_count,
+                'attempt': attempt,
                 'wait_time': wait_time
             })
             return True
-            
-        except Exception as reconnect_error:
-            logger.error(f"Reconnection failed: {reconnect_error}")
-            await self._notify_error_callbacks('reconnection_failed', str(reconnect_error))
-            return await self.handle_reconnection(reconnect_error)
+        
+        logger.error("Max reconnection attempts reached: %s", self.max_reconnect_attempts)
+        await self._notify_error_callbacks('max_reconnects_reached', str(error))
+        return False
 
 class AudioCaptureService:
     """Main audio capture service coordinating all components"""
@@ -283,10 +537,26 @@ class AudioCaptureService:
         self.stream_manager = AudioStreamManager()
         self.is_capturing = False
         self.current_format = None
+        # Called with each buffered chunk on the analysis worker thread
+        self.chunk_callbacks: List[Callable[[Dict[str, Any]], None]] = []
         
         # Setup callbacks
         self.stream_manager.add_error_callback(self._handle_stream_error)
         
+    def add_chunk_callback(self, callback: Callable[[Dict[str, Any]], None]):
+        """Add a callback receiving each captured chunk
+        
+        Callbacks run on the analysis worker thread with a dict of 'audio_data' (float32
+        view), 'sample_rate' and 'timestamp'. The samples may live in a buffer that is
+        reused for the next chunk, so a callback that keeps them must copy.
+        """
+        self.chunk_callbacks.append(callback)
+    
+    def remove_chunk_callback(self, callback: Callable[[Dict[str, Any]], None]):
+        """Remove a chunk callback"""
+        if callback in self.chunk_callbacks:
+            self.chunk_callbacks.remove(callback)
+    
     async def start_capture(self, config: Dict[str, Any]) -> bool:
         """Start audio capture with given configuration"""
         try:
@@ -297,7 +567,7 @@ class AudioCaptureService:
             return True
             
         except Exception as e:
-            logger.error(f"Failed to start audio capture: {e}")
+            logger.error("Failed to start audio capture: %s", e)
             await self._handle_stream_error('capture_start_failed', str(e))
             return False
     
@@ -306,47 +576,109 @@ class AudioCaptureService:
         self.is_capturing = False
         self.stream_manager.stop_stream()
         self.buffer.clear()
+        self.quality_monitor.reset_resampler()
         logger.info("Audio capture stopped")
     
     async def process_audio_chunk(self, audio_data: bytes, metadata: Dict[str, Any]) -> bool:
         """Process incoming audio chunk"""
         try:
-            # Write to buffer
-            success = self.buffer.write(audio_data)
-            
-            if not success:
-                logger.warning("Failed to write audio data to buffer")
-                return False
-            
-            # Convert to numpy array for analysis
-            try:
-                audio_array = np.frombuffer(audio_data, dtype=np.float32)
-                sample_rate = metadata.get('sample_rate', 44100)
-                
-                # Analyze quality
-                quality_metrics = self.quality_monitor.detect_format(audio_array, sample_rate)
-                
-                # Optimize if needed
-                if self.quality_monitor.auto_adjustment_enabled:
-                    optimized_audio = self.quality_monitor.optimize_for_ml(
-                        audio_array, sample_rate, target_sr=16000
-                    )
-                    # Could store optimized version for ML processing
-                
-            except Exception as analysis_error:
-                logger.warning(f"Audio analysis failed: {analysis_error}")
-            
-            return True
+            # Buffer and analyze off the event loop so other connections keep being served;
+            # callers await each chunk before sending the next, so chunks stay in order
+            sample_rate = metadata.get('sample_rate', 44100)
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(
+                analysis_executor, self._ingest_chunk, audio_data, sample_rate, metadata.get('timestamp')
+            )
             
         except Exception as e:
-            logger.error(f"Error processing audio chunk: {e}")
+            logger.error("Error processing audio chunk: %s", e)
             await self._handle_stream_error('chunk_processing_failed', str(e))
             return False
     
+    def _ingest_chunk(self, audio_data: bytes, sample_rate: int, timestamp: Optional[float] = None) -> bool:
+        """Write a chunk to the buffer, hand it to chunk callbacks and analyze it (runs in a worker)"""
+        if not self.buffer.write(audio_data):
+            logger.warning("Failed to write audio data to buffer")
+            return False
+        
+        if self.chunk_callbacks:
+            chunk = {
+                'audio_data': np.frombuffer(audio_data, dtype=np.float32),
+                'sample_rate': sample_rate,
+                'timestamp': timestamp
+            }
+            for callback in self.chunk_callbacks:
+                try:
+                    callback(chunk)
+                except Exception as e:
+                    logger.error("Chunk callback error: %s", e)
+        
+        try:
+            self._analyze_chunk(audio_data, sample_rate)
+        except Exception as analysis_error:
+            logger.warning("Audio analysis failed: %s", analysis_error)
+        return True
+    
+    async def capture_from_file(self, path: str, blocksize: int = 4096) -> int:
+        """Analyze an audio file block by block, as if it had been streamed in
+        
+        libsndfile decodes straight to float32 blocks; the file is the backing store,
+        so blocks bypass the capture buffer. Returns the number of blocks analyzed.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(analysis_executor, self._analyze_file, path, blocksize)
+    
+    def _analyze_file(self, path: str, blocksize: int) -> int:
+        """Stream a file through chunk analysis (runs in a worker)"""
+        sample_rate = sf.info(path).samplerate
+        self.quality_monitor.reset_resampler()
+        count = 0
+        for block in sf.blocks(path, blocksize=blocksize, dtype='float32', always_2d=False):
+            if block.ndim > 1:
+                block = downmix(block)
+            self._analyze_array(block, sample_rate)
+            count += 1
+        return count
+    
+    def _analyze_chunk(self, audio_data: bytes, sample_rate: int):
+        """Run quality analysis and ML optimization on a chunk (CPU-bound, runs in a worker)"""
+        # Convert to numpy array for analysis
+        self._analyze_array(np.frombuffer(audio_data, dtype=np.float32), sample_rate)
+    
+    def _analyze_array(self, audio_array: np.ndarray, sample_rate: int):
+        """Quality analysis and ML optimization of decoded float32 samples"""
+        # Analyze quality
+        self.quality_monitor.detect_format(audio_array, sample_rate)
+        
+        # Optimize if needed
+        if self.quality_monitor.auto_adjustment_enabled:
+            optimized_audio = self.quality_monitor.optimize_for_ml(
+                audio_array, sample_rate, target_sr=16000
+            )
+            # Could store optimized version for ML processing
+    
+    def set_buffer_window(self, seconds: float, sample_rate: int, channels: int = 1) -> bool:
+        """Size the capture buffer to hold the most recent seconds of audio
+        
+        Writes past capacity evict the oldest bytes, so the buffer then never holds
+        more than the window. Returns False, leaving the buffer unchanged, when the
+        format gives a non-positive size (e.g. a zero sample rate in a client header).
+        """
+        max_bytes = int(seconds * sample_rate) * channels * BYTES_PER_SAMPLE
+        if max_bytes <= 0:
+            return False
+        if max_bytes != self.buffer.max_size:
+            self.buffer.resize(max_bytes)
+        return True
+    
     def get_audio_data(self, size: int) -> bytes:
         """Get audio data from buffer"""
         return self.buffer.read(size)
     
+    def get_audio_data_into(self, dst) -> int:
+        """Move buffered audio into a caller-owned writable buffer, returning bytes copied"""
+        return self.buffer.read_into(dst)
+    
     def get_buffer_stats(self) -> Dict[str, Any]:
         """Get buffer statistics"""
         stats = self.buffer.get_stats()
@@ -356,7 +688,7 @@ class AudioCaptureService:
     
     async def _handle_stream_error(self, error_type: str, error_message: str):
         """Handle stream errors"""
-        logger.error(f"Stream error [{error_type}]: {error_message}")
+        logger.error("Stream error [%s]: %s", error_type, error_message)
         
         # Attempt recovery based on error type
         if error_type in ['connection_lost', 'capture_start_failed']:
@@ -368,7 +700,7 @@ class AudioCaptureService:
     
     def handle_youtube_state_change(self, state: str, data: Dict[str, Any]):
         """Handle YouTube player state changes"""
-        logger.info(f"YouTube player state changed: {state}")
+        logger.info("YouTube player state changed: %s", state)
         
         if state == 'paused':
             # Could pause processing to save resources
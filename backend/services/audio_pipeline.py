@@ -9,16 +9,42 @@ import time
 from typing import Dict, Any, Optional, List, Tuple, Callable
 from dataclasses import dataclass, asdict
 import numpy as np
-from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
 import threading
-import queue
 
-from .audio_capture import AudioCaptureManager
-from .audio_streaming import AudioStreamingManager
-from ..utils.audio_processing import AudioProcessor, AudioMetadata
+from .audio_capture import AudioCaptureService
+from .audio_streaming import AudioStreamingService
+from utils.audio_processing import AudioProcessor, AudioMetadata
+from utils.audio_kernels import sum_squares
 
 logger = logging.getLogger(__name__)
 
+# Longest a partial batch of processed chunks waits for more before being sent
+SEND_FLUSH_INTERVAL = 0.05
+
+# Log only every Nth processed-chunk overrun so a stalled consumer doesn't flood the log
+OVERFLOW_LOG_INTERVAL = 100
+
+# Full-scale multiplier for int16 PCM on the wire
+INT16_SCALE = 32767.0
+
+def to_wire(audio_data: np.ndarray, wire_dtype: str) -> np.ndarray:
+    """
+    Encode float audio in [-1, 1] for transmission.
+    
+    'int16' is 16-bit PCM (sample / 32767), 'bfloat16' keeps the top half of each
+    float32 (truncated, sent as uint16), 'float32' sends samples as they are.
+    """
+    if wire_dtype == 'int16':
+        scaled = np.multiply(audio_data, INT16_SCALE, dtype=np.float32)
+        np.clip(scaled, -32768.0, 32767.0, out=scaled)
+        return scaled.astype(np.int16)
+    samples = np.ascontiguousarray(audio_data, dtype=np.float32)
+    if wire_dtype == 'bfloat16':
+        return (samples.view(np.uint32) >> 16).astype(np.uint16)
+    return samples
+
 @dataclass
 class PipelineConfig:
     """Configuration for audio pipeline processing"""
@@ -42,8 +68,10 @@ class PipelineConfig:
     adaptive_quality: bool = True    # Adapt processing based on quality
     skip_silent_chunks: bool = True  # Skip chunks with low energy
     energy_threshold: float = 0.01   # Minimum energy to process
+    batch_send_size: int = 4         # Max processed chunks coalesced into one send
+    wire_dtype: str = 'int16'        # Sample encoding on the wire: 'int16', 'bfloat16' or 'float32'
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class ProcessedChunk:
     """Container for processed audio chunk with metadata"""
     chunk_id: int
@@ -54,6 +82,153 @@ class ProcessedChunk:
     timestamp: float
     quality_adjusted: bool = False
 
+# Per-process AudioProcessor, built once by the pool initializer
+_worker_processor: Optional[AudioProcessor] = None
+
+def _init_worker(target_sample_rate: int):
+    """ProcessPoolExecutor initializer: build this worker's AudioProcessor."""
+    global _worker_processor
+    _worker_processor = AudioProcessor(target_sample_rate=target_sample_rate)
+
+def _process_chunk_in_worker(chunk_id: int, audio_data: np.ndarray, sample_rate: int,
+                             timestamp: float, settings: Tuple[bool, bool, float, bool]) -> ProcessedChunk:
+    """Top-level (picklable) entry point for chunks submitted to the process pool."""
+    return process_chunk(_worker_processor, chunk_id, audio_data, sample_rate, timestamp, settings)
+
+def process_chunk(processor: AudioProcessor, chunk_id: int, audio_data: np.ndarray,
+                  sample_rate: int, timestamp: float,
+                  settings: Tuple[bool, bool, float, bool]) -> ProcessedChunk:
+    """
+    Process a single audio chunk.
+    
+    Args:
+        processor: AudioProcessor to run the chunk through
+        chunk_id: Unique chunk identifier
+        audio_data: Raw audio data
+        sample_rate: Sample rate
+        timestamp: Chunk timestamp
+        settings: (normalize_audio, apply_filtering, quality_threshold, adaptive_quality)
+        
+    Returns:
+        ProcessedChunk with the processed audio and its metadata
+    """
+    normalize, filter_audio, quality_threshold, adaptive_quality = settings
+    # Durations come from the monotonic clock; wall time can step under NTP
+    start_time = time.monotonic()
+    
+    # Process audio through pipeline
+    processed_audio, metadata = processor.process_audio_chunk(
+        audio_data, 
+        sample_rate,
+        normalize=normalize,
+        filter_audio=filter_audio
+    )
+    
+    processing_time = time.monotonic() - start_time
+    
+    # Check quality threshold
+    quality_adjusted = False
+    if metadata.quality_score < quality_threshold:
+        if adaptive_quality:
+            # Try alternative processing for low quality audio; if the first pass
+            # already normalized and filtered, a rerun would reproduce it exactly
+            if not (normalize and filter_audio):
+                processed_audio, metadata = processor.process_audio_chunk(
+                    audio_data, 
+                    sample_rate,
+                    normalize=True,
+                    filter_audio=True
+                )
+                quality_adjusted = True
+        else:
+            logger.warning("Chunk %s quality %.3f below threshold", chunk_id, metadata.quality_score)
+    
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Processed chunk %s: %s samples, quality %.3f, time %.3fs",
+                     chunk_id, len(processed_audio), metadata.quality_score, processing_time)
+    
+    return ProcessedChunk(
+        chunk_id=chunk_id,
+        audio_data=processed_audio,
+        metadata=metadata,
+        original_chunk_id=chunk_id,
+        processing_time=processing_time,
+        timestamp=timestamp,
+        quality_adjusted=quality_adjusted
+    )
+
+def _log_send_failure(future):
+    """Done-callback for sends scheduled from worker threads."""
+    if not future.cancelled() and future.exception() is not None:
+        logger.error("Error sending processed chunk: %s", future.exception())
+
+def _run_chunk_callback(callback: Callable[[ProcessedChunk], None], processed_chunk: ProcessedChunk):
+    """Run a plain chunk callback on the callback thread, logging its errors."""
+    try:
+        callback(processed_chunk)
+    except Exception as e:
+        logger.error("Error in chunk callback %s: %s", callback.__name__, e)
+
+async def _run_async_chunk_callback(callback: Callable[[ProcessedChunk], Any], processed_chunk: ProcessedChunk):
+    """Await a coroutine chunk callback on the event loop, logging its errors."""
+    try:
+        await callback(processed_chunk)
+    except Exception as e:
+        logger.error("Error in chunk callback %s: %s", callback.__name__, e)
+
+class SPSCRing:
+    """
+    Bounded single-producer/single-consumer ring of object references.
+
+    The producer only advances ``tail`` and the consumer only advances ``head``;
+    slot stores and int rebinds are atomic under the GIL, so neither side locks.
+    When full the producer overwrites the oldest slot and the consumer skips
+    past whatever was overrun. The producer also clears slots the consumer has
+    moved past, so popped chunks don't stay referenced until they are lapped.
+    """
+    __slots__ = ('buf', 'mask', 'head', 'tail', 'released')
+
+    def __init__(self, capacity: int):
+        size = 1 << max(capacity - 1, 0).bit_length()
+        self.buf: List[Any] = [None] * size
+        self.mask = size - 1
+        self.head = 0
+        self.tail = 0
+        self.released = 0
+
+    def __len__(self) -> int:
+        return min(self.tail - self.head, self.mask + 1)
+
+    def push_overwrite(self, item) -> bool:
+        """Append item (producer side), overwriting the oldest entry when full. Returns False if it did."""
+        buf, mask = self.buf, self.mask
+        tail, head = self.tail, self.head
+        # Only the producer stores into slots and the consumer never reads below
+        # head again, so consumed entries still in their slots can be dropped here
+        for index in range(max(self.released, tail - mask), head):
+            buf[index & mask] = None
+        self.released = max(self.released, head)
+        buf[tail & mask] = item
+        self.tail = tail + 1
+        return tail - head <= mask
+
+    def pop(self):
+        """Remove and return the oldest item (consumer side), or None if empty."""
+        while True:
+            head, tail = self.head, self.tail
+            if head == tail:
+                return None
+            head = max(head, tail - self.mask - 1)
+            item = self.buf[head & self.mask]
+            # Re-check: the producer may have lapped this slot while we read it
+            if self.tail - self.mask - 1 <= head:
+                self.head = head + 1
+                return item
+
+    def clear(self):
+        """Drop everything queued so far (consumer side; meant for shutdown)."""
+        self.head = self.tail
+
 class AudioPipelineManager:
     """
     Manages the complete audio processing pipeline from capture to ML-ready output.
@@ -68,18 +243,25 @@ class AudioPipelineManager:
             config: Pipeline configuration
         """
         self.config = config or PipelineConfig()
+        # Flat config snapshot for stats; kept in step by update_config
+        self._config_dict = asdict(self.config)
         
         # Initialize components
         self.audio_processor = AudioProcessor(target_sample_rate=self.config.target_sample_rate)
-        self.capture_manager = AudioCaptureManager()
-        self.streaming_manager = AudioStreamingManager()
+        self.capture_manager = AudioCaptureService()
+        self.streaming_manager = AudioStreamingService()
         
         # Pipeline state
         self.is_running = False
-        self.processed_chunks: queue.Queue = queue.Queue(maxsize=self.config.max_buffer_size)
+        self._energy_thresh_sq = self.config.energy_threshold ** 2
+        self.processed_chunks = SPSCRing(self.config.max_buffer_size)
+        self._chunk_ready = threading.Event()
+        # Done-callbacks fire on any pool worker; serialize them into the ring's single producer
+        self._publish_lock = threading.Lock()
         self.processing_stats = {
             'chunks_processed': 0,
             'chunks_skipped': 0,
+            'chunks_dropped': 0,
             'processing_errors': 0,
             'quality_improvements': 0,
             'total_processing_time': 0.0,
@@ -87,32 +269,50 @@ class AudioPipelineManager:
         }
         
         # Thread management
-        self.processing_executor = ThreadPoolExecutor(max_workers=self.config.max_workers)
-        self.pipeline_thread = None
-        self.stop_event = threading.Event()
+        # Processing is CPU-bound numpy/scipy work; worker processes sidestep the GIL
+        self.processing_executor = ProcessPoolExecutor(
+            max_workers=self.config.max_workers,
+            initializer=_init_worker,
+            initargs=(self.config.target_sample_rate,)
+        )
+        self._next_chunk_id = 0
+        # Caps chunks queued or running in the pool at two per worker
+        self._inflight = threading.BoundedSemaphore(self.config.max_workers * 2)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._send_queue: asyncio.Queue = asyncio.Queue()
+        self._send_task: Optional[asyncio.Task] = None
         
-        # Callbacks for processed audio
-        self.chunk_callbacks: List[Callable[[ProcessedChunk], None]] = []
+        # Callbacks for processed audio, split by kind at registration: coroutine
+        # callbacks run on the event loop, plain ones on a dedicated callback thread
+        self._sync_callbacks: List[Callable[[ProcessedChunk], None]] = []
+        self._async_callbacks: List[Callable[[ProcessedChunk], Any]] = []
+        self._callback_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='pipeline-callbacks')
         
         logger.info(f"AudioPipelineManager initialized with config: {self.config}")
     
     def add_chunk_callback(self, callback: Callable[[ProcessedChunk], None]):
-        """Add callback for processed chunks."""
-        self.chunk_callbacks.append(callback)
+        """Add callback for processed chunks (plain function or coroutine function)."""
+        if asyncio.iscoroutinefunction(callback):
+            self._async_callbacks.append(callback)
+        else:
+            self._sync_callbacks.append(callback)
         logger.debug(f"Added chunk callback: {callback.__name__}")
     
     def remove_chunk_callback(self, callback: Callable[[ProcessedChunk], None]):
         """Remove chunk callback."""
-        if callback in self.chunk_callbacks:
-            self.chunk_callbacks.remove(callback)
-            logger.debug(f"Removed chunk callback: {callback.__name__}")
+        for callbacks in (self._sync_callbacks, self._async_callbacks):
+            if callback in callbacks:
+                callbacks.remove(callback)
+                logger.debug(f"Removed chunk callback: {callback.__name__}")
     
-    async def start_pipeline(self, websocket_url: str = "ws://localhost:8000/ws/audio") -> bool:
+    async def start_pipeline(self, websocket=None, capture_config: Optional[Dict[str, Any]] = None) -> bool:
         """
         Start the complete audio pipeline.
         
         Args:
-            websocket_url: WebSocket URL for streaming
+            websocket: Connected WebSocket to stream processed chunks to; without one,
+                chunks are only delivered to callbacks and get_next_processed_chunk
+            capture_config: Configuration passed to the capture service
             
         Returns:
             True if pipeline started successfully
@@ -125,23 +325,22 @@ class AudioPipelineManager:
             logger.info("Starting audio pipeline...")
             
             # Start capture manager
-            if not await self.capture_manager.start_capture():
+            if not await self.capture_manager.start_capture(capture_config or {}):
                 logger.error("Failed to start audio capture")
                 return False
             
             # Start streaming manager
-            if not await self.streaming_manager.connect(websocket_url):
-                logger.error("Failed to connect streaming manager")
-                await self.capture_manager.stop_capture()
-                return False
+            if websocket is not None:
+                self.streaming_manager.set_websocket(websocket)
+                self.streaming_manager.start_streaming()
             
-            # Start processing pipeline
+            # Start processing pipeline; chunks finish off-loop and are sent back onto it
+            self._loop = asyncio.get_running_loop()
             self.is_running = True
-            self.stop_event.clear()
             
-            # Start pipeline thread
-            self.pipeline_thread = threading.Thread(target=self._run_pipeline_loop, daemon=True)
-            self.pipeline_thread.start()
+            # Captured chunks are pushed straight into processing as they arrive
+            self.capture_manager.add_chunk_callback(self._on_raw_chunk)
+            self._send_task = asyncio.create_task(self._send_loop())
             
             logger.info("Audio pipeline started successfully")
             return True
@@ -161,232 +360,234 @@ class AudioPipelineManager:
             
             # Signal stop
             self.is_running = False
-            self.stop_event.set()
+            self.capture_manager.remove_chunk_callback(self._on_raw_chunk)
             
-            # Wait for pipeline thread to finish
-            if self.pipeline_thread and self.pipeline_thread.is_alive():
-                self.pipeline_thread.join(timeout=5.0)
+            # Stop the send loop before the streaming connection goes away
+            if self._send_task:
+                self._send_task.cancel()
+                self._send_task = None
             
             # Stop components
             await self.capture_manager.stop_capture()
-            await self.streaming_manager.disconnect()
-            
-            # Shutdown thread pool
-            self.processing_executor.shutdown(wait=True, timeout=5.0)
+            self.streaming_manager.stop_streaming()
+            
+            # Shutdown worker pools. Executors take no timeout, so cancel chunks that
+            # haven't started instead of waiting on them; chunks already running finish
+            # into _handle_processed_chunk, so the callback thread goes down after the
+            # pool (its queued callbacks still run). The wait happens in a thread so the
+            # event loop keeps serving other connections meanwhile
+            await asyncio.get_running_loop().run_in_executor(
+                None, partial(self.processing_executor.shutdown, wait=True, cancel_futures=True)
+            )
+            self._callback_executor.shutdown(wait=False)
             
-            # Clear queues
-            while not self.processed_chunks.empty():
-                try:
-                    self.processed_chunks.get_nowait()
-                except queue.Empty:
-                    break
+            # Clear queues (O(1): the consumer index jumps to the producer's)
+            self.processed_chunks.clear()
             
             logger.info("Audio pipeline stopped")
             
         except Exception as e:
             logger.error(f"Error stopping pipeline: {e}")
     
-    def _run_pipeline_loop(self):
-        """Main pipeline processing loop (runs in separate thread)."""
-        logger.info("Pipeline processing loop started")
-        
-        chunk_id = 0
+    def _on_raw_chunk(self, raw_chunk: Dict[str, Any]):
+        """Capture callback: gate and dispatch each raw chunk as soon as it is captured."""
+        if not self.is_running:
+            return
         
         try:
-            while self.is_running and not self.stop_event.is_set():
+            # Extract audio data and metadata
+            audio_data = raw_chunk.get('audio_data')
+            sample_rate = raw_chunk.get('sample_rate', 44100)
+            timestamp = raw_chunk.get('timestamp')
+            if timestamp is None:
+                # Only read the clock when capture didn't stamp the chunk (a .get()
+                # default would be evaluated for every chunk)
+                timestamp = time.time()
+            
+            if audio_data is None or len(audio_data) == 0:
+                return
+            
+            # Check if chunk should be skipped
+            if self.config.skip_silent_chunks and self._is_silent_chunk(audio_data):
+                self.processing_stats['chunks_skipped'] += 1
+                return
+            
+            # Capture may reuse the samples' memory for its next chunk, and the pool
+            # pickles arguments later on its feeder thread, so take an owned float32 copy
+            audio_data = np.array(audio_data, dtype=np.float32)
+            
+            chunk_id = self._next_chunk_id
+            self._next_chunk_id += 1
+            
+            # Submit for async processing
+            if self.config.async_processing:
+                # Back-pressure: with every in-flight slot taken, skip the chunk rather
+                # than letting pickled chunks pile up in the pool's work queue
+                if not self._inflight.acquire(timeout=0.01):
+                    self.processing_stats['chunks_skipped'] += 1
+                    return
                 try:
-                    # Get raw audio chunk from capture manager
-                    raw_chunk = self.capture_manager.get_next_chunk(timeout=0.1)
-                    
-                    if raw_chunk is None:
-                        time.sleep(0.01)  # Brief pause if no data
-                        continue
-                    
-                    # Extract audio data and metadata
-                    audio_data = raw_chunk.get('audio_data')
-                    sample_rate = raw_chunk.get('sample_rate', 44100)
-                    timestamp = raw_chunk.get('timestamp', time.time())
-                    
-                    if audio_data is None or len(audio_data) == 0:
-                        continue
-                    
-                    # Check if chunk should be skipped
-                    if self.config.skip_silent_chunks and self._is_silent_chunk(audio_data):
-                        self.processing_stats['chunks_skipped'] += 1
-                        continue
-                    
-                    # Submit for async processing
-                    if self.config.async_processing:
-                        future = self.processing_executor.submit(
-                            self._process_audio_chunk,
-                            chunk_id, audio_data, sample_rate, timestamp
-                        )
-                        
-                        # Handle future result (non-blocking)
-                        def handle_result(fut):
-                            try:
-                                processed_chunk = fut.result(timeout=self.config.processing_timeout)
-                                if processed_chunk:
-                                    self._handle_processed_chunk(processed_chunk)
-                            except Exception as e:
-                                logger.error(f"Error processing chunk {chunk_id}: {e}")
-                                self.processing_stats['processing_errors'] += 1
-                        
-                        future.add_done_callback(handle_result)
-                    else:
-                        # Synchronous processing
-                        processed_chunk = self._process_audio_chunk(
-                            chunk_id, audio_data, sample_rate, timestamp
-                        )
-                        if processed_chunk:
-                            self._handle_processed_chunk(processed_chunk)
-                    
-                    chunk_id += 1
-                    
-                except Exception as e:
-                    logger.error(f"Error in pipeline loop: {e}")
-                    self.processing_stats['processing_errors'] += 1
-                    time.sleep(0.1)  # Brief pause on error
+                    future = self.processing_executor.submit(
+                        _process_chunk_in_worker,
+                        chunk_id, audio_data, sample_rate, timestamp,
+                        self._chunk_settings()
+                    )
+                except Exception:
+                    self._inflight.release()
+                    raise
+                # Handle future result (non-blocking); bind this chunk's id now,
+                # since chunk_id moves on before the callback fires
+                future.add_done_callback(partial(self._on_chunk_done, chunk_id))
+            else:
+                # Synchronous processing
+                processed_chunk = self._process_audio_chunk(
+                    chunk_id, audio_data, sample_rate, timestamp
+                )
+                if processed_chunk:
+                    self._handle_processed_chunk(processed_chunk)
         
         except Exception as e:
-            logger.error(f"Fatal error in pipeline loop: {e}")
-        
-        finally:
-            logger.info("Pipeline processing loop ended")
+            logger.error("Error dispatching captured chunk: %s", e)
+            self.processing_stats['processing_errors'] += 1
     
     def _is_silent_chunk(self, audio_data: np.ndarray) -> bool:
         """Check if audio chunk is silent or has very low energy."""
-        try:
-            if len(audio_data) == 0:
-                return True
-            
-            # Calculate RMS energy
-            rms_energy = np.sqrt(np.mean(audio_data ** 2))
-            
-            return rms_energy < self.config.energy_threshold
-        except:
-            return False
+        n = audio_data.size
+        if n == 0:
+            return True
+        # mean(x**2) < threshold**2 in one compiled pass: no temporary, no sqrt
+        return float(sum_squares(audio_data.reshape(-1))) < self._energy_thresh_sq * n
+    
+    def _chunk_settings(self) -> Tuple[bool, bool, float, bool]:
+        """Snapshot of the config fields a worker needs to process one chunk."""
+        return (self.config.normalize_audio, self.config.apply_filtering,
+                self.config.quality_threshold, self.config.adaptive_quality)
     
     def _process_audio_chunk(self, chunk_id: int, audio_data: np.ndarray, 
                            sample_rate: int, timestamp: float) -> Optional[ProcessedChunk]:
-        """
-        Process a single audio chunk.
-        
-        Args:
-            chunk_id: Unique chunk identifier
-            audio_data: Raw audio data
-            sample_rate: Sample rate
-            timestamp: Chunk timestamp
-            
-        Returns:
-            ProcessedChunk if processing successful, None otherwise
-        """
-        start_time = time.time()
-        
+        """Process a chunk in the calling thread (synchronous pipeline mode)."""
         try:
-            # Process audio through pipeline
-            processed_audio, metadata = self.audio_processor.process_audio_chunk(
-                audio_data, 
-                sample_rate,
-                normalize=self.config.normalize_audio,
-                filter_audio=self.config.apply_filtering
-            )
-            
-            processing_time = time.time() - start_time
-            
-            # Check quality threshold
-            quality_adjusted = False
-            if metadata.quality_score < self.config.quality_threshold:
-                if self.config.adaptive_quality:
-                    # Try alternative processing for low quality audio
-                    processed_audio, metadata = self.audio_processor.process_audio_chunk(
-                        audio_data, 
-                        sample_rate,
-                        normalize=True,
-                        filter_audio=True
-                    )
-                    quality_adjusted = True
-                else:
-                    logger.warning(f"Chunk {chunk_id} quality {metadata.quality_score:.3f} below threshold")
-            
-            # Create processed chunk
-            processed_chunk = ProcessedChunk(
-                chunk_id=chunk_id,
-                audio_data=processed_audio,
-                metadata=metadata,
-                original_chunk_id=chunk_id,
-                processing_time=processing_time,
-                timestamp=timestamp,
-                quality_adjusted=quality_adjusted
-            )
-            
-            # Update statistics
-            self.processing_stats['chunks_processed'] += 1
-            self.processing_stats['total_processing_time'] += processing_time
-            self.processing_stats['average_chunk_time'] = (
-                self.processing_stats['total_processing_time'] / 
-                max(self.processing_stats['chunks_processed'], 1)
-            )
-            
-            if quality_adjusted:
-                self.processing_stats['quality_improvements'] += 1
-            
-            logger.debug(f"Processed chunk {chunk_id}: "
-                        f"{len(processed_audio)} samples, "
-                        f"quality {metadata.quality_score:.3f}, "
-                        f"time {processing_time:.3f}s")
-            
-            return processed_chunk
-            
+            return process_chunk(self.audio_processor, chunk_id, audio_data,
+                                 sample_rate, timestamp, self._chunk_settings())
         except Exception as e:
-            logger.error(f"Error processing chunk {chunk_id}: {e}")
+            logger.error("Error processing chunk %s: %s", chunk_id, e)
             self.processing_stats['processing_errors'] += 1
             return None
     
+    def _on_chunk_done(self, chunk_id: int, future: Future):
+        """Done-callback for a chunk submitted to the process pool."""
+        self._inflight.release()
+        if future.cancelled():  # dropped by shutdown
+            return
+        try:
+            processed_chunk = future.result()
+            if processed_chunk:
+                self._handle_processed_chunk(processed_chunk)
+        except Exception as e:
+            logger.error("Error processing chunk %s: %s", chunk_id, e)
+            self.processing_stats['processing_errors'] += 1
+    
+    def _record_chunk_stats(self, processed_chunk: ProcessedChunk):
+        """Fold a finished chunk into the pipeline statistics (caller holds _publish_lock)."""
+        stats = self.processing_stats
+        stats['chunks_processed'] += 1
+        stats['total_processing_time'] += processed_chunk.processing_time
+        stats['average_chunk_time'] = stats['total_processing_time'] / stats['chunks_processed']
+        if processed_chunk.quality_adjusted:
+            stats['quality_improvements'] += 1
+    
     def _handle_processed_chunk(self, processed_chunk: ProcessedChunk):
         """Handle a successfully processed chunk."""
         try:
-            # Add to processed chunks queue
-            try:
-                self.processed_chunks.put(processed_chunk, block=False)
-            except queue.Full:
-                # Remove oldest chunk if queue is full
-                try:
-                    self.processed_chunks.get_nowait()
-                    self.processed_chunks.put(processed_chunk, block=False)
-                    logger.warning("Processed chunk queue full, removed oldest chunk")
-                except queue.Empty:
-                    pass
-            
-            # Send to streaming manager for transmission
-            asyncio.create_task(self._send_processed_chunk(processed_chunk))
-            
-            # Call registered callbacks
-            for callback in self.chunk_callbacks:
-                try:
-                    callback(processed_chunk)
-                except Exception as e:
-                    logger.error(f"Error in chunk callback {callback.__name__}: {e}")
+            # Add to processed chunks ring (overwrites the oldest chunk when full)
+            with self._publish_lock:
+                stored = self.processed_chunks.push_overwrite(processed_chunk)
+                self._record_chunk_stats(processed_chunk)
+                if not stored:
+                    self.processing_stats['chunks_dropped'] += 1
+                    dropped = self.processing_stats['chunks_dropped']
+            self._chunk_ready.set()
+            if not stored and dropped % OVERFLOW_LOG_INTERVAL == 1:
+                logger.warning("Processed chunk queue full, dropped oldest chunk (%s dropped so far)", dropped)
+            
+            # Hand registered callbacks off first so they overlap with the send
+            for callback in self._sync_callbacks:
+                self._callback_executor.submit(_run_chunk_callback, callback, processed_chunk)
+            
+            # Send to streaming manager for transmission (we're on a worker or pipeline thread)
+            if self._loop is not None:
+                for callback in self._async_callbacks:
+                    asyncio.run_coroutine_threadsafe(
+                        _run_async_chunk_callback(callback, processed_chunk), self._loop
+                    )
+                future = asyncio.run_coroutine_threadsafe(
+                    self._send_processed_chunk(processed_chunk), self._loop
+                )
+                future.add_done_callback(_log_send_failure)
         
         except Exception as e:
             logger.error(f"Error handling processed chunk: {e}")
     
     async def _send_processed_chunk(self, processed_chunk: ProcessedChunk):
-        """Send processed chunk via streaming manager."""
+        """Queue processed chunk for the batching send loop."""
+        self._send_queue.put_nowait(processed_chunk)
+    
+    async def _send_loop(self):
+        """Coalesce up to batch_send_size chunks into each streaming send."""
+        send_queue = self._send_queue
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await send_queue.get()]
+            deadline = loop.time() + SEND_FLUSH_INTERVAL
+            while len(batch) < self.config.batch_send_size:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(send_queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+            await self._send_batch(batch)
+    
+    @staticmethod
+    def _chunk_payload(processed_chunk: ProcessedChunk) -> Dict[str, Any]:
+        """Transmission fields for one chunk, without its audio."""
+        return {
+            'chunk_id': processed_chunk.chunk_id,
+            'sample_rate': processed_chunk.metadata.sample_rate,
+            'channels': processed_chunk.metadata.channels,
+            'timestamp': processed_chunk.timestamp,
+            'quality_score': processed_chunk.metadata.quality_score,
+            'processing_time': processed_chunk.processing_time
+        }
+    
+    async def _send_batch(self, batch: List[ProcessedChunk]):
+        """Send one or more processed chunks via streaming manager in a single frame."""
+        if not self.streaming_manager.is_streaming_active():
+            return
         try:
-            # Prepare chunk data for transmission
-            chunk_data = {
-                'chunk_id': processed_chunk.chunk_id,
-                'audio_data': processed_chunk.audio_data.tobytes(),
-                'sample_rate': processed_chunk.metadata.sample_rate,
-                'channels': processed_chunk.metadata.channels,
-                'timestamp': processed_chunk.timestamp,
-                'quality_score': processed_chunk.metadata.quality_score,
-                'processing_time': processed_chunk.processing_time
-            }
+            # Byte views over the wire samples; each memoryview keeps its array alive until sent
+            wire_dtype = self.config.wire_dtype
+            views = [memoryview(to_wire(chunk.audio_data, wire_dtype)).cast('B') for chunk in batch]
+            if len(batch) == 1:
+                metadata = self._chunk_payload(batch[0])
+                audio_data = views[0]
+            else:
+                # Concatenated audio; each entry records where its samples start (in chunk_id order)
+                entries = []
+                offset = 0
+                for chunk, view in zip(batch, views):
+                    entry = self._chunk_payload(chunk)
+                    entry['offset'] = offset
+                    entry['nbytes'] = view.nbytes
+                    entries.append(entry)
+                    offset += view.nbytes
+                metadata = {'batch': entries}
+                audio_data = b''.join(views)
+            metadata['dtype'] = wire_dtype
             
             # Send via streaming manager
-            await self.streaming_manager.send_audio_chunk(chunk_data)
+            await self.streaming_manager.send_audio_chunk(audio_data, metadata)
             
         except Exception as e:
             logger.error(f"Error sending processed chunk: {e}")
@@ -401,10 +602,14 @@ class AudioPipelineManager:
         Returns:
             ProcessedChunk if available, None if timeout
         """
-        try:
-            return self.processed_chunks.get(timeout=timeout)
-        except queue.Empty:
-            return None
+        chunk = self.processed_chunks.pop()
+        if chunk is None:
+            # Clear then re-check so a push between the two pops can't be missed
+            self._chunk_ready.clear()
+            chunk = self.processed_chunks.pop()
+            if chunk is None and self._chunk_ready.wait(timeout):
+                chunk = self.processed_chunks.pop()
+        return chunk
     
     def get_pipeline_stats(self) -> Dict[str, Any]:
         """Get comprehensive pipeline statistics."""
@@ -412,11 +617,11 @@ class AudioPipelineManager:
         
         # Add component stats
         stats.update({
-            'capture_stats': self.capture_manager.get_capture_stats(),
+            'capture_stats': self.capture_manager.get_buffer_stats(),
             'streaming_stats': self.streaming_manager.get_streaming_stats(),
-            'processing_queue_size': self.processed_chunks.qsize(),
+            'processing_queue_size': len(self.processed_chunks),
             'is_running': self.is_running,
-            'config': asdict(self.config)
+            'config': self._config_dict.copy()
         })
         
         return stats
@@ -426,6 +631,9 @@ class AudioPipelineManager:
         for key, value in kwargs.items():
             if hasattr(self.config, key):
                 setattr(self.config, key, value)
+                self._config_dict[key] = value
+                if key == 'energy_threshold':
+                    self._energy_thresh_sq = value ** 2
                 logger.info(f"Updated config {key} = {value}")
             else:
                 logger.warning(f"Unknown config parameter: {key}")
@@ -441,20 +649,20 @@ class AudioPipelineManager:
 # Utility functions for pipeline management
 
 async def create_pipeline(config: Optional[PipelineConfig] = None, 
-                         websocket_url: str = "ws://localhost:8000/ws/audio") -> AudioPipelineManager:
+                         websocket=None) -> AudioPipelineManager:
     """
     Create and start an audio pipeline.
     
     Args:
         config: Pipeline configuration
-        websocket_url: WebSocket URL for streaming
+        websocket: Connected WebSocket for streaming, if any
         
     Returns:
         Started AudioPipelineManager
     """
     pipeline = AudioPipelineManager(config)
     
-    if await pipeline.start_pipeline(websocket_url):
+    if await pipeline.start_pipeline(websocket):
         return pipeline
     else:
         raise RuntimeError("Failed to start audio pipeline")
@@ -475,7 +683,9 @@ def create_default_config(target_sample_rate: int = 16000,
         processing_timeout=5.0,
         adaptive_quality=True,
         skip_silent_chunks=True,
-        energy_threshold=0.01
+        energy_threshold=0.01,
+        batch_send_size=4,
+        wire_dtype='int16'
     )
 
 if __name__ == "__main__":
@@ -7,16 +7,32 @@ Handles efficient audio streaming with compression and error recovery
 import asyncio
 import logging
 import time
-import json
 import struct
 import hashlib
 from typing import Dict, Optional, List, Callable, Any, Tuple
 from dataclasses import dataclass
+from functools import partial
 from collections import deque
 import numpy as np
+import orjson
+
+from utils.audio_compression import AudioCompressionUtils
 
 logger = logging.getLogger(__name__)
 
+# Outbound audio frame layout (little-endian):
+# [descriptor length:u32][orjson packet descriptor][packet audio bytes]
+# The descriptor carries the packet fields, chunk metadata and compression algorithm,
+# so the samples travel in the same binary frame as the header describing them.
+AUDIO_FRAME_HEADER = struct.Struct('<I')
+
+def unpack_audio_frame(frame: bytes) -> Tuple[Dict[str, Any], memoryview]:
+    """Split an outbound audio frame into its descriptor and a view of its audio bytes"""
+    view = memoryview(frame)
+    (descriptor_size,) = AUDIO_FRAME_HEADER.unpack_from(view)
+    body = AUDIO_FRAME_HEADER.size + descriptor_size
+    return orjson.loads(view[AUDIO_FRAME_HEADER.size:body]), view[body:]
+
 @dataclass
 class AudioPacket:
     """Audio packet with metadata"""
@@ -42,11 +58,6 @@ class AudioCompressor:
     """Handle audio compression for efficient transmission"""
     
     def __init__(self):
-        # Import the compression utility
-        import sys
-        import os
-        sys.path.append(os.path.dirname(os.path.dirname(__file__)))
-        from utils.audio_compression import AudioCompressionUtils
         self.compression_utils = AudioCompressionUtils()
         self.compression_enabled = True
         self.adaptive_compression = True
@@ -69,13 +80,13 @@ class AudioCompressor:
             compressed_data, compression_ratio, was_compressed, algorithm = self.compression_utils.compress_audio_data(audio_data)
             
             if was_compressed:
-                logger.debug(f"Audio compressed: {len(audio_data)} -> {len(compressed_data)} bytes ({compression_ratio:.2f} ratio, {algorithm})")
+                logger.debug("Audio compressed: %s -> %s bytes (%.2f ratio, %s)", len(audio_data), len(compressed_data), compression_ratio, algorithm)
                 return compressed_data, compression_ratio, algorithm
             else:
                 return audio_data, 1.0, 'none'
                 
         except Exception as e:
-            logger.warning(f"Compression failed: {e}")
+            logger.warning("Compression failed: %s", e)
             return audio_data, 1.0, 'none'
     
     def decompress_audio(self, compressed_data: bytes) -> bytes:
@@ -83,10 +94,10 @@ class AudioCompressor:
         try:
             decompressed_data, was_compressed = self.compression_utils.decompress_audio_data(compressed_data)
             if was_compressed:
-                logger.debug(f"Audio decompressed: {len(compressed_data)} -> {len(decompressed_data)} bytes")
+                logger.debug("Audio decompressed: %s -> %s bytes", len(compressed_data), len(decompressed_data))
             return decompressed_data
         except Exception as e:
-            logger.error(f"Decompression failed: {e}")
+            logger.error("Decompression failed: %s", e)
             raise
     
     def get_compression_info(self) -> Dict[str, Any]:
@@ -96,7 +107,7 @@ class AudioCompressor:
     def enable_adaptive_compression(self, enabled: bool = True):
         """Enable or disable adaptive compression"""
         self.adaptive_compression = enabled
-        logger.info(f"Adaptive compression {'enabled' if enabled else 'disabled'}")
+        logger.info("Adaptive compression %s", 'enabled' if enabled else 'disabled')
     
     def set_compression_algorithm(self, algorithm: str):
         """Set preferred compression algorithm"""
@@ -106,9 +117,9 @@ class AudioCompressor:
             else:
                 self.compression_enabled = True
                 self.compression_utils.preferred_algorithm = algorithm
-            logger.info(f"Compression algorithm set to: {algorithm}")
+            logger.info("Compression algorithm set to: %s", algorithm)
         else:
-            logger.warning(f"Unknown compression algorithm: {algorithm}")
+            logger.warning("Unknown compression algorithm: %s", algorithm)
     
     def adapt_compression_level(self, network_speed: float, latency: float):
         """Adapt compression level based on network conditions"""
@@ -131,7 +142,7 @@ class AudioSynchronizer:
         """Synchronize client and server clocks"""
         self.client_server_offset = server_timestamp - client_timestamp
         self.last_sync_time = time.time()
-        logger.info(f"Clock sync: offset = {self.client_server_offset:.3f}s")
+        logger.info("Clock sync: offset = %.3fs", self.client_server_offset)
     
     def needs_sync(self) -> bool:
         """Check if clock sync is needed"""
@@ -176,17 +187,21 @@ class PacketManager:
     
     def __init__(self):
         self.expected_sequence = 0
-        self.received_packets = {}
+        # Pending packets and their arrival times are kept in parallel maps keyed by
+        # sequence; the arrival log is in time order so expiry only looks at its head
+        self.received_packets: Dict[int, AudioPacket] = {}
+        self.received_times: Dict[int, float] = {}
+        self.arrival_log: deque = deque()
         self.missing_packets = set()
         self.max_reorder_window = 10
         self.packet_timeout = 5.0  # 5 seconds
         
     def add_packet(self, packet: AudioPacket) -> List[AudioPacket]:
         """Add packet and return any complete sequences"""
-        self.received_packets[packet.sequence_number] = {
-            'packet': packet,
-            'received_time': time.time()
-        }
+        now = time.monotonic()
+        self.received_packets[packet.sequence_number] = packet
+        self.received_times[packet.sequence_number] = now
+        self.arrival_log.append((now, packet.sequence_number))
         
         # Check for missing packets
         if packet.sequence_number > self.expected_sequence:
@@ -197,13 +212,13 @@ class PacketManager:
         # Return complete sequence
         complete_packets = []
         while self.expected_sequence in self.received_packets:
-            packet_info = self.received_packets.pop(self.expected_sequence)
-            complete_packets.append(packet_info['packet'])
+            complete_packets.append(self.received_packets.pop(self.expected_sequence))
+            del self.received_times[self.expected_sequence]
             self.missing_packets.discard(self.expected_sequence)
             self.expected_sequence += 1
         
         # Clean up old packets
-        self._cleanup_old_packets()
+        self._cleanup_old_packets(now)
         
         return complete_packets
     
@@ -211,23 +226,24 @@ class PacketManager:
         """Get list of missing packet sequence numbers"""
         return list(self.missing_packets)
     
-    def _cleanup_old_packets(self):
-        """Remove packets that have timed out"""
-        current_time = time.time()
-        expired_sequences = []
-        
-        for seq, packet_info in self.received_packets.items():
-            if current_time - packet_info['received_time'] > self.packet_timeout:
-                expired_sequences.append(seq)
-        
-        for seq in expired_sequences:
-            self.received_packets.pop(seq, None)
-            self.missing_packets.discard(seq)
+    def _cleanup_old_packets(self, current_time: float):
+        """Remove packets that have timed out (amortized O(1) per packet)"""
+        deadline = current_time - self.packet_timeout
+        arrival_log = self.arrival_log
+        while arrival_log and arrival_log[0][0] < deadline:
+            received_time, seq = arrival_log.popleft()
+            # Skip log entries for packets already delivered or since re-received
+            if self.received_times.get(seq) == received_time:
+                del self.received_packets[seq]
+                del self.received_times[seq]
+                self.missing_packets.discard(seq)
     
     def reset(self):
         """Reset packet manager state"""
         self.expected_sequence = 0
         self.received_packets.clear()
+        self.received_times.clear()
+        self.arrival_log.clear()
         self.missing_packets.clear()
 
 class NetworkMonitor:
@@ -246,6 +262,10 @@ class NetworkMonitor:
         self.total_bytes_sent = 0
         self.total_bytes_received = 0
         self.latency_samples = deque(maxlen=100)
+        self.recent_latency_samples = deque(maxlen=10)
+        # Running sums over both windows, so metrics update in O(1) per packet
+        self.latency_sum = 0.0
+        self.recent_latency_sum = 0.0
         
     def record_packet_sent(self, size: int):
         """Record a packet being sent"""
@@ -256,11 +276,19 @@ class NetworkMonitor:
         """Record a packet being received"""
         self.packets_received += 1
         self.total_bytes_received += size
-        self.latency_samples.append(latency)
+        self.latency_sum += latency - self._push(self.latency_samples, latency)
+        self.recent_latency_sum += latency - self._push(self.recent_latency_samples, latency)
         
         # Update metrics
         self._update_metrics()
     
+    @staticmethod
+    def _push(window: deque, value: float) -> float:
+        """Append to a bounded window, returning the sample it evicted (0.0 if none)"""
+        evicted = window[0] if len(window) == window.maxlen else 0.0
+        window.append(value)
+        return evicted
+    
     def _update_metrics(self):
         """Update network quality metrics"""
         # Calculate packet loss rate
@@ -269,11 +297,11 @@ class NetworkMonitor:
         
         # Calculate average latency
         if self.latency_samples:
-            self.average_latency = sum(self.latency_samples) / len(self.latency_samples)
+            self.average_latency = self.latency_sum / len(self.latency_samples)
         
         # Estimate bandwidth (simplified)
-        if self.latency_samples:
-            recent_latency = sum(list(self.latency_samples)[-10:]) / min(10, len(self.latency_samples))
+        if self.recent_latency_samples:
+            recent_latency = self.recent_latency_sum / len(self.recent_latency_samples)
             self.bandwidth_estimate = max(1.0, 100.0 / (recent_latency + 1))  # Rough estimate
         
         # Calculate quality score
@@ -326,17 +354,21 @@ class AudioStreamingService:
         
         # WebSocket connection state
         self.websocket = None
+        # (callback, is_coroutine_function) pairs, classified once at registration
         self.connection_callbacks = []
         self.data_callbacks = []
+        # Coroutine callbacks run as tasks so a slow consumer never stalls the
+        # streaming path; held here until done so they aren't garbage-collected
+        self._pending_callbacks = set()
         self.is_streaming = False
     
     def add_connection_callback(self, callback: Callable):
         """Add callback for connection events"""
-        self.connection_callbacks.append(callback)
+        self.connection_callbacks.append((callback, asyncio.iscoroutinefunction(callback)))
     
     def add_data_callback(self, callback: Callable):
         """Add callback for data events"""
-        self.data_callbacks.append(callback)
+        self.data_callbacks.append((callback, asyncio.iscoroutinefunction(callback)))
     
     def set_websocket(self, websocket):
         """Set the WebSocket connection for streaming"""
@@ -412,24 +444,26 @@ class AudioStreamingService:
                 compression_ratio=compression_ratio
             )
             
-            # Send packet
+            # Send the descriptor and the audio together as one binary frame
             packet_data = {
                 'type': 'audio_packet',
                 'packet': packet.to_dict(),
                 'metadata': metadata,
                 'algorithm': algorithm
             }
+            descriptor = orjson.dumps(packet_data, option=orjson.OPT_SERIALIZE_NUMPY)
+            frame = b''.join((AUDIO_FRAME_HEADER.pack(len(descriptor)), descriptor, compressed_data))
             
-            await self.websocket.send(json.dumps(packet_data))
+            await self.websocket.send_bytes(frame)
             
             # Update statistics
-            self.network_monitor.record_packet_sent(len(compressed_data))
+            self.network_monitor.record_packet_sent(len(frame))
             self.sequence_number += 1
             
             return True
             
         except Exception as e:
-            logger.error(f"Failed to send audio chunk: {e}")
+            logger.error("Failed to send audio chunk: %s", e)
             await self._handle_send_error(e)
             return False
     
@@ -452,21 +486,16 @@ class AudioStreamingService:
             
             # Process complete packets
             if complete_packets:
-                processed_data = b''
-                for pkt in complete_packets:
-                    if pkt.is_compressed:
-                        audio_data = self.compressor.decompress_audio(pkt.data)
-                    else:
-                        audio_data = pkt.data
-                    
-                    processed_data += audio_data
-                
-                return processed_data
+                # Joined once at the end; += would recopy the accumulated bytes per packet
+                return b''.join(
+                    self.compressor.decompress_audio(pkt.data) if pkt.is_compressed else pkt.data
+                    for pkt in complete_packets
+                )
             
             return None
             
         except Exception as e:
-            logger.error(f"Failed to receive audio packet: {e}")
+            logger.error("Failed to receive audio packet: %s", e)
             return None
     
     async def handle_connection_loss(self):
@@ -492,7 +521,7 @@ class AudioStreamingService:
                 
             except Exception as e:
                 retry_count += 1
-                logger.warning(f"Reconnection attempt {retry_count} failed: {e}")
+                logger.warning("Reconnection attempt %s failed: %s", retry_count, e)
         
         # Max retries reached
         await self._notify_connection_callbacks('max_retries_reached', {
@@ -515,29 +544,48 @@ class AudioStreamingService:
         if "connection" in str(error).lower():
             await self.handle_connection_loss()
         else:
-            logger.error(f"Send error: {error}")
+            logger.error("Send error: %s", error)
     
     async def _notify_connection_callbacks(self, event_type: str, data: Dict[str, Any]):
         """Notify connection callbacks"""
-        for callback in self.connection_callbacks:
-            try:
-                if asyncio.iscoroutinefunction(callback):
-                    await callback(event_type, data)
-                else:
-                    callback(event_type, data)
-            except Exception as e:
-                logger.error(f"Connection callback error: {e}")
+        self._dispatch(self.connection_callbacks, "Connection callback error", event_type, data)
     
     async def _notify_data_callbacks(self, event_type: str, data: bytes):
         """Notify data callbacks"""
-        for callback in self.data_callbacks:
+        self._dispatch(self.data_callbacks, "Data callback error", event_type, data)
+    
+    def _dispatch(self, callbacks: List[Tuple[Callable, bool]], error_label: str, *args):
+        """
+        Call sync callbacks in order and schedule coroutine callbacks as tasks.
+        
+        Streaming loops must not await consumers inline: the caller returns as soon
+        as the callbacks are scheduled, so its latency is max(own work, consumer)
+        rather than the sum.
+        """
+        for callback, is_coroutine in callbacks:
             try:
-                if asyncio.iscoroutinefunction(callback):
-                    await callback(event_type, data)
+                if is_coroutine:
+                    task = asyncio.create_task(callback(*args))
+                    self._pending_callbacks.add(task)
+                    task.add_done_callback(partial(self._callback_done, error_label))
                 else:
-                    callback(event_type, data)
+                    callback(*args)
             except Exception as e:
-                logger.error(f"Data callback error: {e}")
+                logger.error("%s: %s", error_label, e)
+    
+    def _callback_done(self, error_label: str, task: asyncio.Task):
+        """Release a finished callback task and log its failure"""
+        self._pending_callbacks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.error("%s: %s", error_label, task.exception())
+    
+    async def drain_callbacks(self, timeout: float = 1.0):
+        """Wait for scheduled callbacks to finish, cancelling any still running after timeout"""
+        if not self._pending_callbacks:
+            return
+        done, pending = await asyncio.wait(set(self._pending_callbacks), timeout=timeout)
+        for task in pending:
+            task.cancel()
     
     def get_streaming_stats(self) -> Dict[str, Any]:
         """Get comprehensive streaming statistics"""
@@ -567,6 +615,5 @@ class AudioStreamingService:
                 self.network_monitor.average_latency
             )
             
-            logger.info(f"Adapted to network conditions: "
-                       f"chunk_size={self.chunk_size}, "
-                       f"compression_algorithm={self.compressor.compression_utils.preferred_algorithm}")
+            logger.info("Adapted to network conditions: chunk_size=%s, compression_algorithm=%s",
+                       self.chunk_size, self.compressor.compression_utils.preferred_algorithm)
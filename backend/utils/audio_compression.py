@@ -110,8 +110,9 @@ class AudioCompressionUtils:
         
         try:
             # Read algorithm marker and original size
-            algorithm_id, original_size = struct.unpack('!BI', compressed_data[:5])
-            compressed_payload = compressed_data[5:]
+            algorithm_id, original_size = struct.unpack_from('!BI', compressed_data)
+            # A view past the header; slicing the bytes would copy the whole payload
+            compressed_payload = memoryview(compressed_data)[5:]
             
             if algorithm_id == 1:  # LZ4
                 return self._decompress_lz4(compressed_payload, original_size)
@@ -135,10 +136,10 @@ class AudioCompressionUtils:
                 return decompressed, True
             else:
                 logger.warning(f"LZ4 decompression size mismatch: {len(decompressed)} != {original_size}")
-                return compressed_data, False
+                return bytes(compressed_data), False
         except Exception as e:
             logger.error(f"LZ4 decompression failed: {e}")
-            return compressed_data, False
+            return bytes(compressed_data), False
     
     def _decompress_zlib(self, compressed_data: bytes, original_size: int) -> Tuple[bytes, bool]:
         """Decompress zlib data"""
@@ -148,10 +149,10 @@ class AudioCompressionUtils:
                 return decompressed, True
             else:
                 logger.warning(f"zlib decompression size mismatch: {len(decompressed)} != {original_size}")
-                return compressed_data, False
+                return bytes(compressed_data), False
         except Exception as e:
             logger.error(f"zlib decompression failed: {e}")
-            return compressed_data, False
+            return bytes(compressed_data), False
     
     def _decompress_flac(self, compressed_data: bytes, original_size: int) -> Tuple[bytes, bool]:
         """Decompress FLAC data"""
@@ -167,11 +168,11 @@ class AudioCompressionUtils:
                 return decompressed, True
             else:
                 logger.warning(f"FLAC decompression size mismatch: {len(decompressed)} != {original_size}")
-                return compressed_data, False
+                return bytes(compressed_data), False
                 
         except Exception as e:
             logger.error(f"FLAC decompression failed: {e}")
-            return compressed_data, False
+            return bytes(compressed_data), False
     
     def adapt_compression_settings(self, network_speed: float, latency: float, cpu_usage: float):
         """Adapt compression settings based on network and system conditions"""
@@ -0,0 +1,206 @@
+"""
+Compiled numeric kernels for TrueTone audio processing
+Fuses the per-sample passes of the hot paths into single loops with Numba,
+falling back to equivalent numpy code when Numba is not installed.
+"""
+
+import logging
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+logger = logging.getLogger(__name__)
+
+# Import this module as utils.audio_kernels from every entry point (importing the
+# backend package puts that root on sys.path), so its kernels compile once per process.
+# They are warmed up at startup rather than cached to disk: a cache entry records the
+# module name it was built under and fails to load when audio_processing runs as a
+# script and imports this file as plain audio_kernels.
+
+# fastmath without 'nnan'/'ninf' so the NaN/Inf scrubbing below isn't optimized away
+FASTMATH_FLAGS = {'nsz', 'arcp', 'contract', 'afn', 'reassoc'}
+
+if njit is not None:
+    @njit(fastmath=FASTMATH_FLAGS, inline='always')
+    def _scrub(value):
+        """Map NaN to silence and +/-Inf to full scale"""
+        if value != value:
+            return 0.0
+        if value > 1.0e308:
+            return 1.0
+        if value < -1.0e308:
+            return -1.0
+        return value
+
+    @njit(fastmath=FASTMATH_FLAGS)
+    def _scale_clip(x, out, scale):
+        """out = clip(x * scale, -1, 1) in a single vectorized pass"""
+        for i in range(x.shape[0]):
+            v = x[i] * scale
+            out[i] = 1.0 if v > 1.0 else (-1.0 if v < -1.0 else v)
+
+    @njit(fastmath=FASTMATH_FLAGS)
+    def _scrub_level(x, use_rms):
+        """Peak or RMS level of x with NaN/Inf sanitized"""
+        level = 0.0
+        for i in range(x.shape[0]):
+            v = _scrub(x[i])
+            if use_rms:
+                level += v * v
+            else:
+                level = max(level, abs(v))
+        if use_rms:
+            level = np.sqrt(level / x.shape[0])
+        return level
+
+    @njit(fastmath=FASTMATH_FLAGS)
+    def _scrub_scale_clip(x, out, scale):
+        """Sanitize NaN/Inf, scale and clip in a single pass"""
+        for i in range(x.shape[0]):
+            v = _scrub(x[i]) * scale
+            out[i] = 1.0 if v > 1.0 else (-1.0 if v < -1.0 else v)
+
+    @njit(fastmath=FASTMATH_FLAGS)
+    def sum_squares(x):
+        """Energy of x, accumulated in x's own precision (reassociated into SIMD partial sums)"""
+        total = x.dtype.type(0)
+        for i in range(x.shape[0]):
+            total += x[i] * x[i]
+        return total
+
+    @njit(fastmath=FASTMATH_FLAGS)
+    def _downmix(frames, out):
+        """Average each frame's interleaved channels; stereo vectorizes as (L + R) * 0.5"""
+        channels = frames.shape[1]
+        if channels == 2:
+            for i in range(frames.shape[0]):
+                out[i] = (frames[i, 0] + frames[i, 1]) * 0.5
+        else:
+            scale = 1.0 / channels
+            for i in range(frames.shape[0]):
+                acc = frames[i, 0]
+                for c in range(1, channels):
+                    acc += frames[i, c]
+                out[i] = acc * scale
+
+    @njit(fastmath=FASTMATH_FLAGS)
+    def _sign_changes(bits, shift):
+        """Count sign flips between neighbours by XOR-ing raw IEEE sign bits (branch-free)"""
+        crossings = 0
+        for i in range(1, bits.shape[0]):
+            crossings += (bits[i] ^ bits[i - 1]) >> shift
+        return crossings
+else:
+    def _scale_clip(x, out, scale):
+        np.multiply(x, scale, out=out)
+        np.clip(out, -1.0, 1.0, out=out)
+
+    def _scrub_level(x, use_rms):
+        clean = np.nan_to_num(x, nan=0.0, posinf=1.0, neginf=-1.0)
+        return np.sqrt(np.mean(clean ** 2)) if use_rms else np.max(np.abs(clean))
+
+    def _scrub_scale_clip(x, out, scale):
+        _scale_clip(np.nan_to_num(x, nan=0.0, posinf=1.0, neginf=-1.0), out, scale)
+
+    def sum_squares(x):
+        return np.dot(x, x)
+
+    def _downmix(frames, out):
+        np.mean(frames, axis=1, out=out)
+
+    def _sign_changes(bits, shift):
+        return int(np.count_nonzero((bits[1:] ^ bits[:-1]) >> shift))
+
+# Unsigned views exposing the IEEE sign bit as the top bit
+_SIGN_VIEWS = {
+    np.dtype(np.float32): (np.uint32, np.uint32(31)),
+    np.dtype(np.float64): (np.uint64, np.uint64(63)),
+}
+
+def zero_crossings(x: np.ndarray) -> int:
+    """Number of sign changes in a 1-D signal"""
+    view = _SIGN_VIEWS.get(x.dtype)
+    if view is None or not x.flags.c_contiguous:
+        negative = np.signbit(x)
+        return int(np.count_nonzero(negative[1:] != negative[:-1]))
+    bits_type, shift = view
+    return int(_sign_changes(x.view(bits_type), shift))
+
+def quality_stats(x: np.ndarray):
+    """
+    Sum of squares, max, min and zero-crossing count of a 1-D signal.
+
+    The reductions use numpy's SIMD kernels (no temporaries); zero crossings
+    are counted on the raw sign bits, which vectorizes where a float compare
+    loop does not.
+    """
+    return float(np.dot(x, x)), x.max(), x.min(), zero_crossings(x)
+
+def downmix(frames: np.ndarray) -> np.ndarray:
+    """
+    Mono mix of interleaved (frames, channels) audio.
+
+    One pass over the frames; numpy's mean over a narrow inner axis runs a
+    separate small reduction per frame and is tens of times slower for stereo.
+    """
+    dtype = frames.dtype if np.issubdtype(frames.dtype, np.floating) else np.float64
+    out = np.empty(frames.shape[0], dtype=dtype)
+    if frames.shape[0] and frames.shape[1]:
+        _downmix(frames, out)
+    return out
+
+def scrub_normalize(audio_data: np.ndarray, target_level: float, method: str = 'peak',
+                    out: np.ndarray = None) -> np.ndarray:
+    """
+    Replace NaN/Inf, normalize to a peak or RMS target and clip to [-1, 1].
+
+    The level is measured with numpy's SIMD reductions (NaN/Inf propagate into it,
+    so finite input is confirmed for free), then scaling and clipping run as one
+    fused pass. Only input containing NaN/Inf takes the slower sanitizing kernels.
+
+    Args:
+        audio_data: Input audio (any shape; processed as a flat buffer)
+        target_level: Target peak or RMS level
+        method: 'peak' or 'rms'
+        out: Optional preallocated output with the same number of elements
+
+    Returns:
+        Normalized audio with the input's shape
+    """
+    flat = np.ascontiguousarray(audio_data).reshape(-1)
+    if out is None:
+        dtype = audio_data.dtype if np.issubdtype(audio_data.dtype, np.floating) else np.float64
+        out = np.empty(flat.shape[0], dtype=dtype)
+    out_flat = out.reshape(-1)
+    if flat.shape[0] == 0:
+        return out.reshape(audio_data.shape)
+
+    use_rms = method == 'rms'
+    if use_rms:
+        level = float(np.sqrt(np.dot(flat, flat) / flat.shape[0]))
+    else:
+        level = float(max(flat.max(), -flat.min()))
+
+    finite = np.isfinite(level)
+    if not finite:
+        level = float(_scrub_level(flat, use_rms))
+
+    scale = target_level / level if level > 0.0 else 1.0
+    if finite:
+        _scale_clip(flat, out_flat, scale)
+    else:
+        _scrub_scale_clip(flat, out_flat, scale)
+    return out.reshape(audio_data.shape)
+
+def warm_up():
+    """Compile the float32 kernels ahead of time so the first live chunk doesn't pay for it"""
+    x = np.zeros(8, dtype=np.float32)
+    scrub_normalize(x, 0.9)
+    scrub_normalize(np.full(8, np.nan, dtype=np.float32), 0.9)
+    scrub_normalize(np.full(8, np.nan, dtype=np.float32), 0.9, method='rms')
+    quality_stats(x)
+    sum_squares(x)
+    downmix(np.zeros((8, 2), dtype=np.float32))
@@ -4,19 +4,75 @@ Handles audio format standardization, resampling, normalization, and conversion.
 """
 
 import numpy as np
+import orjson
 import soundfile as sf
 import librosa
 import logging
+from functools import lru_cache
 from typing import Tuple, Optional, Dict, Any
 from dataclasses import dataclass
 from pathlib import Path
 import warnings
 
+try:
+    import soxr
+except ImportError:
+    soxr = None
+
+try:
+    from scipy.signal import butter, filtfilt, get_window
+except ImportError:
+    butter = filtfilt = get_window = None
+
+try:
+    from scipy.fft import rfft
+except ImportError:
+    rfft = None
+
+try:
+    from utils.audio_kernels import downmix, quality_stats, scrub_normalize
+except ImportError:  # executed directly as a script
+    from audio_kernels import downmix, quality_stats, scrub_normalize
+
 # Suppress librosa warnings for cleaner output
 warnings.filterwarnings("ignore", category=UserWarning, module="librosa")
 
 logger = logging.getLogger(__name__)
 
+@lru_cache(maxsize=32)
+def _butter_coefficients(order: int, normalized_cutoff: float, btype: str):
+    """Design a Butterworth filter once per (order, cutoff, type)"""
+    return butter(order, normalized_cutoff, btype=btype)
+
+# STFT layout used for the spectral centroid (librosa's defaults)
+CENTROID_N_FFT = 2048
+CENTROID_HOP = 512
+
+@lru_cache(maxsize=8)
+def _centroid_tables(sample_rate: int):
+    """Hann window and bin center frequencies, built once per sample rate"""
+    window = get_window('hann', CENTROID_N_FFT, fftbins=True).astype(np.float32)
+    return window, np.fft.rfftfreq(CENTROID_N_FFT, 1.0 / sample_rate)
+
+def mean_spectral_centroid(audio_data: np.ndarray, sample_rate: int) -> float:
+    """
+    Mean spectral centroid of a mono signal, matching librosa.feature.spectral_centroid.
+
+    Frames are strided views over the centered, zero-padded signal and go through
+    one batched real FFT (single precision for float32 input) against the cached
+    window and bin frequencies for this rate.
+    """
+    if rfft is None or get_window is None:
+        return float(np.mean(librosa.feature.spectral_centroid(y=audio_data, sr=sample_rate)[0]))
+    window, freqs = _centroid_tables(sample_rate)
+    padded = np.pad(audio_data, CENTROID_N_FFT // 2)
+    frames = np.lib.stride_tricks.sliding_window_view(padded, CENTROID_N_FFT)[::CENTROID_HOP]
+    magnitudes = np.abs(rfft(frames * window, axis=-1))
+    # Per-frame L1 normalization; silent frames keep a centroid of 0
+    totals = magnitudes.sum(axis=-1)
+    totals[totals < np.finfo(magnitudes.dtype).tiny] = 1.0
+    return float(np.mean((magnitudes @ freqs) / totals))
+
 @dataclass
 class AudioMetadata:
     """Audio metadata tracking throughout pipeline"""
@@ -75,7 +131,7 @@ class AudioProcessor:
         try:
             # Ensure audio is 1D for analysis
             if len(audio_data.shape) > 1:
-                audio_mono = np.mean(audio_data, axis=1)
+                audio_mono = downmix(audio_data)
             else:
                 audio_mono = audio_data
             
@@ -104,7 +160,7 @@ class AudioProcessor:
                 quality_score=quality_score
             )
             
-            logger.debug(f"Audio properties detected: {metadata}")
+            logger.debug("Audio properties detected: %s", metadata)
             return metadata
             
         except Exception as e:
@@ -134,23 +190,24 @@ class AudioProcessor:
             if len(audio_data) == 0:
                 return 0.0
             
-            # Calculate various quality metrics
+            # Calculate various quality metrics; energy and range come from numpy's SIMD
+            # reductions and zero crossings from a sign-bit pass, with no temporaries
+            sum_sq, peak_max, peak_min, crossings = quality_stats(np.ascontiguousarray(audio_data))
             
             # 1. Dynamic range (higher is better)
-            dynamic_range = np.max(audio_data) - np.min(audio_data)
+            dynamic_range = peak_max - peak_min
             dynamic_score = min(dynamic_range / 0.5, 1.0)  # Normalize to 0-1
             
             # 2. RMS energy (presence of signal)
-            rms = np.sqrt(np.mean(audio_data ** 2))
+            rms = np.sqrt(sum_sq / len(audio_data))
             energy_score = min(rms / 0.1, 1.0)  # Normalize to 0-1
             
             # 3. Zero crossing rate (measure of spectral content)
-            zcr = librosa.feature.zero_crossing_rate(audio_data, frame_length=2048, hop_length=512)[0]
-            zcr_score = 1.0 - min(np.mean(zcr) / 0.3, 1.0)  # Lower ZCR often better for speech
+            zcr = crossings / len(audio_data)
+            zcr_score = 1.0 - min(zcr / 0.3, 1.0)  # Lower ZCR often better for speech
             
             # 4. Spectral centroid (frequency content quality)
-            spectral_centroids = librosa.feature.spectral_centroid(y=audio_data, sr=sample_rate)[0]
-            centroid_score = min(np.mean(spectral_centroids) / (sample_rate / 4), 1.0)
+            centroid_score = min(mean_spectral_centroid(audio_data, sample_rate) / (sample_rate / 4), 1.0)
             
             # 5. Sample rate score (higher sample rates generally better)
             sr_score = min(sample_rate / 44100, 1.0)
@@ -187,22 +244,26 @@ class AudioProcessor:
             target_sr = self.target_sample_rate
         
         if original_sr == target_sr:
-            logger.debug(f"No resampling needed, already at {target_sr}Hz")
+            logger.debug("No resampling needed, already at %sHz", target_sr)
             return audio_data, target_sr
         
         try:
-            logger.debug(f"Resampling from {original_sr}Hz to {target_sr}Hz")
-            
-            # Use librosa's high-quality resampling with anti-aliasing
-            resampled_audio = librosa.resample(
-                audio_data, 
-                orig_sr=original_sr, 
-                target_sr=target_sr,
-                res_type='kaiser_best'  # Highest quality resampling
-            )
+            logger.debug("Resampling from %sHz to %sHz", original_sr, target_sr)
+            
+            if soxr is not None:
+                # SoX polyphase resampler (SIMD C), very-high-quality preset
+                resampled_audio = soxr.resample(audio_data, original_sr, target_sr, quality='VHQ')
+            else:
+                # Use librosa's high-quality resampling with anti-aliasing
+                resampled_audio = librosa.resample(
+                    audio_data, 
+                    orig_sr=original_sr, 
+                    target_sr=target_sr,
+                    res_type='kaiser_best'  # Highest quality resampling
+                )
             
             self.processing_stats['resampling_operations'] += 1
-            logger.debug(f"Resampling completed: {len(audio_data)} -> {len(resampled_audio)} samples")
+            logger.debug("Resampling completed: %s -> %s samples", len(audio_data), len(resampled_audio))
             
             return resampled_audio, target_sr
             
@@ -232,19 +293,17 @@ class AudioProcessor:
             elif audio_data.shape[1] == 2:
                 # Stereo to mono conversion
                 logger.debug("Converting stereo to mono")
-                mono_audio = np.mean(audio_data, axis=1)
-                return mono_audio
+                return downmix(audio_data)
             else:
                 # Multi-channel to mono
-                logger.debug(f"Converting {audio_data.shape[1]}-channel audio to mono")
-                mono_audio = np.mean(audio_data, axis=1)
-                return mono_audio
+                logger.debug("Converting %s-channel audio to mono", audio_data.shape[1])
+                return downmix(audio_data)
         
         logger.warning(f"Unexpected audio shape: {audio_data.shape}")
         return audio_data.flatten()
     
     def normalize_audio(self, audio_data: np.ndarray, method: str = 'peak',
-                       target_level: float = 0.8) -> np.ndarray:
+                       target_level: float = 0.8, out: Optional[np.ndarray] = None) -> np.ndarray:
         """
         Normalize audio using various methods.
         
@@ -252,6 +311,7 @@ class AudioProcessor:
             audio_data: Input audio data
             method: Normalization method ('peak', 'rms', 'lufs')
             target_level: Target normalization level
+            out: Optional preallocated output (may be audio_data itself)
             
         Returns:
             Normalized audio data
@@ -260,31 +320,15 @@ class AudioProcessor:
             if len(audio_data) == 0:
                 return audio_data
             
-            if method == 'peak':
-                # Peak normalization
-                max_val = np.max(np.abs(audio_data))
-                if max_val > 0:
-                    normalized_audio = audio_data * (target_level / max_val)
-                else:
-                    normalized_audio = audio_data
-                    
-            elif method == 'rms':
-                # RMS normalization
-                rms = np.sqrt(np.mean(audio_data ** 2))
-                if rms > 0:
-                    normalized_audio = audio_data * (target_level / rms)
-                else:
-                    normalized_audio = audio_data
-                    
-            else:
+            if method not in ('peak', 'rms'):
                 logger.warning(f"Unknown normalization method: {method}, using peak")
-                return self.normalize_audio(audio_data, 'peak', target_level)
+                return self.normalize_audio(audio_data, 'peak', target_level, out)
             
-            # Prevent clipping
-            normalized_audio = np.clip(normalized_audio, -1.0, 1.0)
+            # Scrub NaN/Inf, measure level, scale and clip in one fused kernel
+            normalized_audio = scrub_normalize(audio_data, target_level, method, out=out)
             
             self.processing_stats['normalization_operations'] += 1
-            logger.debug(f"Audio normalized using {method} method")
+            logger.debug("Audio normalized using %s method", method)
             
             return normalized_audio
             
@@ -307,36 +351,37 @@ class AudioProcessor:
         Returns:
             Filtered audio data
         """
+        if butter is None:
+            logger.warning("scipy not available for filtering, skipping")
+            return audio_data
+        
         try:
-            filtered_audio = audio_data.copy()
+            # filtfilt returns a new array, so the input is never modified in place
+            filtered_audio = audio_data
             
             # High-pass filter to remove low-frequency noise
             if high_pass_freq > 0:
-                from scipy.signal import butter, filtfilt
                 nyquist = sample_rate / 2
                 high_pass_norm = high_pass_freq / nyquist
                 
                 if high_pass_norm < 1.0:
-                    b, a = butter(2, high_pass_norm, btype='high')
+                    b, a = _butter_coefficients(2, high_pass_norm, 'high')
                     filtered_audio = filtfilt(b, a, filtered_audio)
-                    logger.debug(f"Applied high-pass filter at {high_pass_freq}Hz")
+                    logger.debug("Applied high-pass filter at %sHz", high_pass_freq)
             
             # Low-pass filter if specified
             if low_pass_freq and low_pass_freq > 0:
-                from scipy.signal import butter, filtfilt
                 nyquist = sample_rate / 2
                 low_pass_norm = low_pass_freq / nyquist
                 
                 if low_pass_norm < 1.0:
-                    b, a = butter(2, low_pass_norm, btype='low')
+                    b, a = _butter_coefficients(2, low_pass_norm, 'low')
                     filtered_audio = filtfilt(b, a, filtered_audio)
-                    logger.debug(f"Applied low-pass filter at {low_pass_freq}Hz")
+                    logger.debug("Applied low-pass filter at %sHz", low_pass_freq)
             
+            if filtered_audio is audio_data:
+                filtered_audio = audio_data.copy()
             return filtered_audio
-            
-        except ImportError:
-            logger.warning("scipy not available for filtering, skipping")
-            return audio_data
         except Exception as e:
             logger.warning(f"Error during filtering: {e}")
             return audio_data
@@ -359,8 +404,9 @@ class AudioProcessor:
             # Detect original properties
             original_metadata = self.detect_audio_properties(audio_data, sample_rate)
             
-            # Start processing
-            processed_audio = audio_data.copy()
+            # Start processing; every step returns a new array or its input untouched,
+            # so the caller's buffer is only copied if no step produced one
+            processed_audio = audio_data
             processing_steps = ["input"]
             
             # Convert to mono if needed
@@ -382,9 +428,16 @@ class AudioProcessor:
             
             # Normalize audio
             if normalize:
-                processed_audio = self.normalize_audio(processed_audio, method='peak', target_level=0.8)
+                # Arrays produced by the steps above are ours, so normalize them in place
+                owned = (processed_audio is not audio_data and processed_audio.flags.writeable
+                         and np.issubdtype(processed_audio.dtype, np.floating))
+                processed_audio = self.normalize_audio(processed_audio, method='peak', target_level=0.8,
+                                                       out=processed_audio if owned else None)
                 processing_steps.append("normalized")
             
+            if processed_audio is audio_data:
+                processed_audio = audio_data.copy()
+            
             # Create final metadata
             final_metadata = self.detect_audio_properties(processed_audio, final_sr)
             final_metadata.processing_steps = processing_steps
@@ -394,8 +447,8 @@ class AudioProcessor:
             if final_metadata.quality_score > original_metadata.quality_score:
                 self.processing_stats['quality_improvements'] += 1
             
-            logger.debug(f"Audio chunk processed: {len(processing_steps)} steps, "
-                        f"quality {original_metadata.quality_score:.2f} -> {final_metadata.quality_score:.2f}")
+            logger.debug("Audio chunk processed: %s steps, quality %.2f -> %.2f", len(processing_steps),
+                         original_metadata.quality_score, final_metadata.quality_score)
             
             return processed_audio, final_metadata
             
@@ -472,7 +525,6 @@ def save_processed_audio(audio_data: np.ndarray, sample_rate: int,
         # Save metadata if provided
         if metadata:
             metadata_path = Path(output_path).with_suffix('.json')
-            import json
             metadata_dict = {
                 'sample_rate': metadata.sample_rate,
                 'channels': metadata.channels,
@@ -482,8 +534,8 @@ def save_processed_audio(audio_data: np.ndarray, sample_rate: int,
                 'quality_score': metadata.quality_score,
                 'processing_steps': metadata.processing_steps
             }
-            with open(metadata_path, 'w') as f:
-                json.dump(metadata_dict, f, indent=2)
+            with open(metadata_path, 'wb') as f:
+                f.write(orjson.dumps(metadata_dict, option=orjson.OPT_INDENT_2))
         
         logger.info(f"Processed audio saved: {output_path}")
         
@@ -1,6 +1,12 @@
 // TrueTone Chrome Extension - Content Script
 console.log('TrueTone content script loaded on:', window.location.href);
 
+// Binary frame header shared with the backend (little-endian):
+// [frame type:u8][channels:u8][sample format:u8][reserved:u8][sequence:u32][sample rate:u32][timestamp:f64]
+const FRAME_HEADER_SIZE = 20;
+const FRAME_TYPE_AUDIO = 0;
+const SAMPLE_FORMAT_FLOAT32 = 0;
+
 class AudioCaptureManager {
   constructor() {
     this.isCapturing = false;
@@ -200,41 +206,22 @@ class AudioCaptureManager {
     if (this.audioBuffer.length === 0 || !this.websocket) return;
     
     try {
-      // Convert audio buffer to Float32Array for proper encoding
-      const audioFloat32 = new Float32Array(this.audioBuffer);
-      
-      // Convert to base64 for transmission
-      const audioBytes = new Uint8Array(audioFloat32.buffer);
-      const base64Audio = btoa(String.fromCharCode.apply(null, audioBytes));
-      
-      // Create audio chunk data matching backend protocol
-      const chunkData = {
-        type: 'audio_chunk',
-        sequence: this.sequenceNumber++,
-        timestamp: Date.now(),
-        sampleRate: this.sampleRate,
-        channels: 1,
-        data: base64Audio, // Base64 encoded audio data
-        metadata: {
-          bufferSize: this.audioBuffer.length,
-          quality: {
-            averageLevel: this.audioQualityMetrics.averageLevel,
-            peakLevel: this.audioQualityMetrics.peakLevel,
-            hasClipping: this.audioQualityMetrics.clipCount > 0,
-            isSilent: this.audioQualityMetrics.silenceCount > this.bufferSize * 0.9,
-            snrEstimate: this.calculateSNR()
-          },
-          compression: {
-            enabled: true,
-            preferredAlgorithm: 'lz4' // Fast compression for real-time
-          }
-        }
-      };
+      // Pack header + raw float32 PCM into a single binary frame (no base64/JSON)
+      const frame = new ArrayBuffer(FRAME_HEADER_SIZE + this.audioBuffer.length * 4);
+      const header = new DataView(frame, 0, FRAME_HEADER_SIZE);
+      const sequence = this.sequenceNumber++;
+      header.setUint8(0, FRAME_TYPE_AUDIO);
+      header.setUint8(1, 1); // channels
+      header.setUint8(2, SAMPLE_FORMAT_FLOAT32);
+      header.setUint32(4, sequence, true);
+      header.setUint32(8, this.sampleRate, true);
+      header.setFloat64(12, Date.now() / 1000, true);
+      new Float32Array(frame, FRAME_HEADER_SIZE).set(this.audioBuffer);
       
       // Send via WebSocket
       if (this.websocket.readyState === WebSocket.OPEN) {
-        this.websocket.send(JSON.stringify(chunkData));
-        console.debug(`Sent audio chunk: ${this.audioBuffer.length} samples, sequence ${chunkData.sequence}`);
+        this.websocket.send(frame);
+        console.debug(`Sent audio chunk: ${this.audioBuffer.length} samples, sequence ${sequence}`);
       }
       
       // Clear buffer and reset metrics
@@ -454,6 +441,19 @@ class AudioCaptureManager {
         }
         break;
         
+      case 'batch':
+        // Replies the backend had queued at the same moment, sent as one frame
+        data.items.forEach(item => this.handleBackendMessage(item));
+        break;
+        
+      case 'audio_chunk_acks':
+        // Acknowledgments coalesced by the backend; buffer stats reflect the latest chunk
+        data.items.forEach(ack => console.debug('Audio chunk processed:', ack.sequence, ack.status));
+        if (data.buffer_stats) {
+          this.handleBufferStats(data.buffer_stats);
+        }
+        break;
+        
       case 'audio_config_response':
         console.log('Audio config response:', data.status);
         if (data.status === 'started') {
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Tests for chunk acknowledgment batching
+Checks that acks are coalesced into one frame per flush window and held back,
+bounded, while a slow client leaves its outbox backed up
+"""
+
+import os
+import sys
+import time
+import asyncio
+import numpy as np
+
+# Add backend directory to path for imports
+sys.path.append(os.path.join(os.path.dirname(__file__), 'backend'))
+
+import main as server
+from main import ConnectionRecord, ACK_FLUSH_INTERVAL, ACK_QUEUE_SIZE, OUTBOX_BACKLOG_LIMIT
+from services.audio_capture import AudioCaptureService, BYTES_PER_SAMPLE
+from services.audio_streaming import AudioStreamingService
+
+def _connection() -> ConnectionRecord:
+    """A connection record without a socket; messages stay in its outbox"""
+    now = time.time()
+    return ConnectionRecord(
+        websocket=None,
+        audio_capture=AudioCaptureService(),
+        audio_streaming=AudioStreamingService(),
+        connected_at=now,
+        last_activity=now,
+    )
+
+def _drain(conn: ConnectionRecord):
+    """Everything currently waiting in the outbox"""
+    messages = []
+    while not conn.outbox.empty():
+        messages.append(conn.outbox.get_nowait())
+    return messages
+
+def test_acks_batched():
+    """Acks queued within one flush window go out as a single frame"""
+    print("📦 Testing ack batching...")
+
+    async def run():
+        conn = _connection()
+        server.queue_ack(conn, {"sequence": 0, **server.ACK_SUCCESS})
+        await asyncio.sleep(ACK_FLUSH_INTERVAL * 3)
+        single, = _drain(conn)
+        assert single["type"] == "audio_chunk_processed" and single["sequence"] == 0
+        assert "buffer_stats" in single and "server_time" in single
+
+        for sequence in range(5):
+            server.queue_ack(conn, {"sequence": sequence, **server.ACK_SUCCESS})
+        await asyncio.sleep(ACK_FLUSH_INTERVAL * 3)
+        batch, = _drain(conn)
+        assert batch["type"] == "audio_chunk_acks"
+        assert [item["sequence"] for item in batch["items"]] == list(range(5))
+        assert conn.ack_flush_task is None and not conn.ack_queue
+
+    asyncio.run(run())
+    print("   ✅ one frame per flush window")
+
+def test_acks_backpressure():
+    """Acks wait while the outbox is backed up, keeping only the newest"""
+    print("\n🚦 Testing ack backpressure...")
+
+    async def run():
+        conn = _connection()
+        for i in range(OUTBOX_BACKLOG_LIMIT):
+            server.queue_message(conn, {"type": "filler", "index": i})
+
+        total = ACK_QUEUE_SIZE + 50
+        for sequence in range(total):
+            server.queue_ack(conn, {"sequence": sequence, **server.ACK_SUCCESS})
+        await asyncio.sleep(ACK_FLUSH_INTERVAL * 4)
+        assert conn.outbox.qsize() == OUTBOX_BACKLOG_LIMIT, "acks sent to a backed-up client"
+        assert conn.ack_flush_task is not None
+
+        # The client catches up: the held acks go out, oldest ones dropped
+        fillers = _drain(conn)
+        assert all(message["type"] == "filler" for message in fillers)
+        await asyncio.sleep(ACK_FLUSH_INTERVAL * 3)
+        batch, = _drain(conn)
+        assert [item["sequence"] for item in batch["items"]] == list(range(total - ACK_QUEUE_SIZE, total))
+
+    asyncio.run(run())
+    print("   ✅ held while backed up, bounded to the newest acks")
+
+def test_buffer_window_from_chunks():
+    """Chunk headers size the capture buffer; a zero sample rate leaves it alone"""
+    print("\n🪟 Testing buffer window from chunk headers...")
+
+    async def run():
+        conn = _connection()
+        chunk = np.zeros(480, dtype=np.float32).tobytes()
+        metadata = {"sequence": 1, "sample_rate": 48000, "channels": 2, "timestamp": time.time()}
+        await server.process_audio_data(conn, chunk, metadata)
+        window = int(conn.max_buffer_seconds * 48000) * 2 * BYTES_PER_SAMPLE
+        assert conn.sample_rate == 48000 and conn.audio_capture.buffer.max_size == window
+
+        await server.process_audio_data(conn, chunk, {**metadata, "sequence": 2, "sample_rate": 0})
+        assert conn.sample_rate == 48000 and conn.audio_capture.buffer.max_size == window
+        assert conn.audio_capture.buffer.available() > 0
+        conn.ack_flush_task.cancel()
+
+    asyncio.run(run())
+    print("   ✅ sized from rate and channels, zero rate ignored")
+
+def main():
+    """Run all ack tests"""
+    print("📨 TrueTone Ack Batching Tests")
+    print("=" * 40)
+
+    test_acks_batched()
+    test_acks_backpressure()
+    test_buffer_window_from_chunks()
+
+    print("\n🎉 ALL ACK TESTS PASSED!")
+
+if __name__ == "__main__":
+    main()
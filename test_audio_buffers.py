@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Tests for TrueTone's audio buffers and wire encoding
+Checks the capture ring buffer against deque semantics, the pipeline's SPSC ring
+and the sample encodings used for transmission
+"""
+
+import os
+import sys
+import random
+import threading
+from collections import deque
+import numpy as np
+
+# Add backend directory to path for imports
+sys.path.append(os.path.join(os.path.dirname(__file__), 'backend'))
+
+from services.audio_capture import AudioBuffer, AudioCaptureService, BYTES_PER_SAMPLE
+from services.audio_pipeline import SPSCRing, to_wire
+
+def test_audio_buffer_matches_deque():
+    """Randomized writes, reads and resizes behave like a bounded byte deque"""
+    print("🔁 Testing AudioBuffer against deque semantics...")
+    rng = random.Random(7)
+    for _ in range(200):
+        capacity = rng.randint(1, 64)
+        buffer = AudioBuffer(capacity)
+        model = deque(maxlen=capacity)
+        for _ in range(80):
+            op = rng.random()
+            if op < 0.45:
+                data = bytes(rng.randrange(256) for _ in range(rng.randint(0, 90)))
+                assert buffer.write(data)
+                model.extend(data)
+            elif op < 0.65:
+                n = rng.randint(0, 40)
+                expected = bytes(model.popleft() for _ in range(min(n, len(model))))
+                assert buffer.read(n) == expected
+            elif op < 0.85:
+                dst = bytearray(rng.randint(0, 40))
+                expected = bytes(model.popleft() for _ in range(min(len(dst), len(model))))
+                n = buffer.read_into(dst)
+                assert n == len(expected) and bytes(dst[:n]) == expected
+            else:
+                capacity = rng.randint(1, 64)
+                buffer.resize(capacity)
+                model = deque(model, maxlen=capacity)
+            assert buffer.available() == len(model)
+    print("   ✅ write/read/read_into/resize across wraparound and overflow")
+
+def test_audio_buffer_counters():
+    """Statistics account for every byte written, read and evicted"""
+    print("\n📊 Testing AudioBuffer statistics...")
+    buffer = AudioBuffer(10)
+    buffer.write(b'0123456789abc')  # oversized: only the newest 10 bytes survive
+    assert buffer.read(100) == b'3456789abc'
+    buffer.write(b'xyz')
+    buffer.resize(2)
+    stats = buffer.get_stats()
+    assert stats['total_written'] == 16 and stats['total_read'] == 10
+    assert stats['overflow_count'] == 3 + 1 and stats['size'] == 2
+    assert buffer.read(2) == b'yz'
+    print("   ✅ oversized write, eviction and resize counters")
+
+def test_buffer_window():
+    """The capture buffer holds the configured window for the stream's format"""
+    print("\n🪟 Testing capture buffer window...")
+    capture = AudioCaptureService()
+    assert capture.set_buffer_window(30, 44100, 2)
+    assert capture.buffer.max_size == 30 * 44100 * 2 * BYTES_PER_SAMPLE
+
+    # Non-positive formats are ignored and leave the buffer as it was
+    for sample_rate, channels in ((0, 1), (-8000, 1), (16000, 0)):
+        assert not capture.set_buffer_window(30, sample_rate, channels)
+        assert capture.buffer.max_size == 30 * 44100 * 2 * BYTES_PER_SAMPLE
+
+    # Once full, the newest window of samples is kept
+    assert capture.set_buffer_window(1, 100, 1)
+    samples = np.arange(250, dtype=np.float32)
+    for block in np.split(samples, 5):
+        capture.buffer.write(block.tobytes())
+    kept = np.frombuffer(capture.get_audio_data(10_000), dtype=np.float32)
+    assert np.array_equal(kept, samples[-100:])
+    print("   ✅ sized from rate and channels, bad headers ignored")
+
+def test_spsc_ring_matches_deque():
+    """Single-threaded pushes and pops behave like a bounded deque"""
+    print("\n💍 Testing SPSCRing against deque semantics...")
+    assert len(SPSCRing(5).buf) == 8 and len(SPSCRing(8).buf) == 8 and len(SPSCRing(1).buf) == 1
+    rng = random.Random(11)
+    for _ in range(200):
+        ring = SPSCRing(rng.randint(1, 16))
+        model = deque(maxlen=ring.mask + 1)
+        for step in range(200):
+            if rng.random() < 0.55:
+                stored = ring.push_overwrite(step)
+                assert stored == (len(model) < model.maxlen)
+                model.append(step)
+                # Slots the consumer has moved past are released on push
+                live = set(model)
+                assert all(item is None or item in live for item in ring.buf)
+            else:
+                assert ring.pop() == (model.popleft() if model else None)
+            assert len(ring) == len(model)
+        ring.clear()
+        assert len(ring) == 0 and ring.pop() is None
+    print("   ✅ overwrite-oldest, pop, clear and slot release")
+
+def test_spsc_ring_threaded():
+    """A consumer racing an overwriting producer sees items in order, each at most once"""
+    print("\n🧵 Testing SPSCRing with a concurrent producer...")
+    ring = SPSCRing(8)
+    total = 200_000
+    seen = []
+
+    def produce():
+        for i in range(total):
+            ring.push_overwrite(i)
+
+    producer = threading.Thread(target=produce)
+    producer.start()
+    while producer.is_alive() or len(ring):
+        item = ring.pop()
+        if item is not None:
+            seen.append(item)
+    producer.join()
+
+    assert seen, "consumer received nothing"
+    assert all(a < b for a, b in zip(seen, seen[1:])), "items out of order or repeated"
+    assert seen[-1] == total - 1
+    print(f"   ✅ {len(seen)} of {total} items received in order")
+
+def test_to_wire():
+    """Wire encodings match their numpy definitions"""
+    print("\n📡 Testing wire encodings...")
+    audio = np.concatenate([
+        np.linspace(-1.0, 1.0, 1001, dtype=np.float32),
+        np.array([1.5, -1.5, 0.0, -0.0], dtype=np.float32),
+    ])
+
+    pcm = to_wire(audio, 'int16')
+    assert pcm.dtype == np.int16
+    expected = np.clip(audio.astype(np.float64) * 32767.0, -32768, 32767).astype(np.int16)
+    assert np.array_equal(pcm, expected)
+
+    halves = to_wire(audio, 'bfloat16')
+    assert halves.dtype == np.uint16
+    assert np.array_equal(halves, (audio.view(np.uint32) >> 16).astype(np.uint16))
+    decoded = (halves.astype(np.uint32) << 16).view(np.float32)
+    assert np.allclose(decoded, audio, rtol=2 ** -7, atol=0)
+
+    passthrough = to_wire(audio.astype(np.float64)[::2], 'float32')
+    assert passthrough.dtype == np.float32 and passthrough.flags.c_contiguous
+    assert np.array_equal(passthrough, audio[::2])
+    print("   ✅ int16, bfloat16 and float32")
+
+def main():
+    """Run all buffer tests"""
+    print("🗃️ TrueTone Buffer Tests")
+    print("=" * 40)
+
+    test_audio_buffer_matches_deque()
+    test_audio_buffer_counters()
+    test_buffer_window()
+    test_spsc_ring_matches_deque()
+    test_spsc_ring_threaded()
+    test_to_wire()
+
+    print("\n🎉 ALL BUFFER TESTS PASSED!")
+
+if __name__ == "__main__":
+    main()
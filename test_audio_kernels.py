@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Tests for the compiled audio kernels
+Checks each kernel against a plain numpy reference, including NaN/Inf and strided input
+"""
+
+import os
+import sys
+import numpy as np
+
+# Add backend directory to path for imports
+sys.path.append(os.path.join(os.path.dirname(__file__), 'backend'))
+
+from utils.audio_kernels import downmix, quality_stats, scrub_normalize, sum_squares, zero_crossings
+
+rng = np.random.default_rng(1234)
+
+def _signals(dtype):
+    """Test signals of one dtype: noise, a tone, silence with signed zeros, and strided views"""
+    noise = rng.standard_normal(4801).astype(dtype) * dtype(0.3)
+    tone = np.sin(np.arange(4800) * 0.05).astype(dtype)
+    zeros = np.array([0.0, -0.0, 0.0, -0.0, 1.0, -1.0], dtype=dtype)
+    return [noise, tone, zeros, noise[::3], tone[1::2], noise[:1], noise[:0]]
+
+def _reference_normalize(x, target, method):
+    """NaN -> 0, +/-Inf -> full scale, then scale to the target level and clip"""
+    clean = np.nan_to_num(x.astype(np.float64), nan=0.0, posinf=1.0, neginf=-1.0)
+    if clean.size == 0:
+        return clean
+    if method == 'rms':
+        level = np.sqrt(np.mean(clean ** 2))
+    else:
+        level = np.max(np.abs(clean))
+    scale = target / level if level > 0 else 1.0
+    return np.clip(clean * scale, -1.0, 1.0)
+
+def test_zero_crossings():
+    """Sign-bit crossing count matches a signbit comparison"""
+    print("🔀 Testing zero crossings...")
+    for dtype in (np.float32, np.float64):
+        for x in _signals(dtype):
+            negative = np.signbit(x)
+            expected = int(np.count_nonzero(negative[1:] != negative[:-1]))
+            assert zero_crossings(x) == expected, f"{dtype.__name__} length {x.size}"
+    # Non-float input takes the signbit fallback
+    ints = np.array([3, -1, -2, 5, 0, -7], dtype=np.int16)
+    assert zero_crossings(ints) == 3
+    print("   ✅ float32/float64, contiguous and strided")
+
+def test_quality_stats():
+    """Energy, range and crossing statistics match numpy"""
+    print("\n📈 Testing quality stats...")
+    for dtype, rtol in ((np.float32, 1e-4), (np.float64, 1e-12)):
+        for x in _signals(dtype):
+            if x.size == 0:
+                continue
+            expected = float(np.sum(x.astype(np.float64) ** 2))
+            sum_sq, peak_max, peak_min, crossings = quality_stats(np.ascontiguousarray(x))
+            assert np.isclose(sum_sq, expected, rtol=rtol, atol=1e-6)
+            assert peak_max == x.max() and peak_min == x.min()
+            negative = np.signbit(x)
+            assert crossings == int(np.count_nonzero(negative[1:] != negative[:-1]))
+    print("   ✅ float32/float64 signals")
+
+def test_sum_squares():
+    """Signal energy matches numpy for contiguous and strided input"""
+    print("\n🔋 Testing sum of squares...")
+    for dtype, rtol in ((np.float32, 1e-4), (np.float64, 1e-12)):
+        for x in _signals(dtype):
+            expected = float(np.sum(x.astype(np.float64) ** 2))
+            assert np.isclose(float(sum_squares(x)), expected, rtol=rtol, atol=1e-6)
+    print("   ✅ float32/float64, contiguous and strided")
+
+def test_scrub_normalize():
+    """Normalization maps NaN/Inf like nan_to_num and matches the numpy chain"""
+    print("\n🧽 Testing scrub_normalize...")
+    for dtype in (np.float32, np.float64):
+        for x in _signals(dtype):
+            dirty = x.copy()
+            if dirty.size >= 4:
+                dirty[[0, dirty.size // 3, dirty.size // 2, -1]] = [np.nan, np.inf, -np.inf, np.nan]
+            for method, target in (('peak', 0.9), ('rms', 0.2)):
+                for signal in (x, dirty):
+                    result = scrub_normalize(signal, target, method=method)
+                    assert result.dtype == dtype and result.shape == signal.shape
+                    assert np.all(np.isfinite(result))
+                    expected = _reference_normalize(signal, target, method)
+                    assert np.allclose(result, expected, rtol=1e-5, atol=1e-6), f"{method} {dtype.__name__}"
+    print("   ✅ peak/rms, clean and NaN/Inf input")
+
+    # All-NaN input is silence, not NaN
+    assert np.all(scrub_normalize(np.full(16, np.nan, dtype=np.float32), 0.9) == 0.0)
+
+    # out= is filled in place and the input's shape is kept
+    block = rng.standard_normal((100, 2)).astype(np.float32)
+    out = np.empty(block.size, dtype=np.float32)
+    result = scrub_normalize(block, 0.5, out=out)
+    assert result.shape == block.shape and np.shares_memory(result, out)
+    assert np.isclose(np.abs(result).max(), 0.5, rtol=1e-6)
+    print("   ✅ all-NaN input, out= buffer and 2-D shape")
+
+def test_downmix():
+    """Channel averaging matches numpy's mean over the channel axis"""
+    print("\n🎚️ Testing downmix...")
+    for channels in (1, 2, 3, 6):
+        frames = rng.standard_normal((1001, channels))
+        for dtype in (np.float32, np.float64):
+            block = frames.astype(dtype)
+            for view in (block, np.asfortranarray(block), block[::2]):
+                result = downmix(view)
+                assert result.dtype == dtype and result.shape == (view.shape[0],)
+                assert np.allclose(result, view.mean(axis=1), rtol=1e-6, atol=1e-6)
+    # Integer PCM mixes into float64
+    pcm = np.array([[100, 300], [-2, 1]], dtype=np.int16)
+    assert np.array_equal(downmix(pcm), np.array([200.0, -0.5]))
+    assert downmix(np.zeros((0, 2), dtype=np.float32)).shape == (0,)
+    print("   ✅ 1-6 channels, C/Fortran order and strided frames")
+
+def main():
+    """Run all kernel tests"""
+    print("🧮 TrueTone Audio Kernel Tests")
+    print("=" * 40)
+
+    test_zero_crossings()
+    test_quality_stats()
+    test_sum_squares()
+    test_scrub_normalize()
+    test_downmix()
+
+    print("\n🎉 ALL KERNEL TESTS PASSED!")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Tests for sending processed audio to the client
+Checks that pipeline chunks reach the socket as binary frames carrying their audio,
+and that the wire encodings shrink what is sent
+"""
+
+import os
+import sys
+import time
+import asyncio
+import numpy as np
+
+# Add backend directory to path for imports
+sys.path.append(os.path.join(os.path.dirname(__file__), 'backend'))
+
+from services.audio_pipeline import AudioPipelineManager, PipelineConfig, ProcessedChunk, to_wire
+from services.audio_streaming import unpack_audio_frame
+from utils.audio_processing import AudioMetadata
+
+class RecordingSocket:
+    """Stands in for a Starlette WebSocket and keeps every binary frame sent"""
+
+    def __init__(self):
+        self.frames = []
+
+    async def send_bytes(self, data: bytes):
+        self.frames.append(bytes(data))
+
+def _chunk(chunk_id: int, samples: int) -> ProcessedChunk:
+    """A processed chunk of a 16 kHz mono tone"""
+    audio = (0.5 * np.sin(np.arange(samples) * 0.03)).astype(np.float32)
+    metadata = AudioMetadata(sample_rate=16000, channels=1, duration=samples / 16000,
+                             bit_depth=32, format='float32', quality_score=0.9)
+    return ProcessedChunk(chunk_id=chunk_id, audio_data=audio, metadata=metadata,
+                          original_chunk_id=chunk_id, processing_time=0.001, timestamp=time.time())
+
+def _send(wire_dtype: str, batch, compress: bool):
+    """Send a batch through a pipeline's streaming manager and return the frames"""
+    pipeline = AudioPipelineManager(PipelineConfig(wire_dtype=wire_dtype))
+    socket = RecordingSocket()
+    pipeline.streaming_manager.set_websocket(socket)
+    pipeline.streaming_manager.start_streaming()
+    pipeline.streaming_manager.compressor.compression_enabled = compress
+    asyncio.run(pipeline._send_batch(batch))
+    return socket.frames, pipeline.streaming_manager
+
+def test_chunk_reaches_socket():
+    """One chunk is sent as a single binary frame holding its encoded samples"""
+    print("📤 Testing processed chunk send...")
+    chunk = _chunk(7, 1600)
+    for compress in (False, True):
+        (frame,), streaming = _send('int16', [chunk], compress)
+        descriptor, audio = unpack_audio_frame(frame)
+        assert descriptor['type'] == 'audio_packet'
+        assert descriptor['metadata']['chunk_id'] == 7 and descriptor['metadata']['dtype'] == 'int16'
+        if descriptor['packet']['is_compressed']:
+            audio = streaming.compressor.decompress_audio(bytes(audio))
+        assert np.array_equal(np.frombuffer(audio, dtype=np.int16), to_wire(chunk.audio_data, 'int16'))
+        assert streaming.network_monitor.total_bytes_sent == len(frame)
+    print("   ✅ descriptor and samples in one frame, with and without compression")
+
+def test_batch_offsets():
+    """Batched chunks share one frame and their offsets index the concatenated audio"""
+    print("\n📚 Testing batched send...")
+    batch = [_chunk(i, 800 + 100 * i) for i in range(3)]
+    (frame,), _ = _send('bfloat16', batch, False)
+    descriptor, audio = unpack_audio_frame(frame)
+    entries = descriptor['metadata']['batch']
+    assert [entry['chunk_id'] for entry in entries] == [0, 1, 2]
+    for entry, chunk in zip(entries, batch):
+        samples = np.frombuffer(audio[entry['offset']:entry['offset'] + entry['nbytes']], dtype=np.uint16)
+        assert np.array_equal(samples, to_wire(chunk.audio_data, 'bfloat16'))
+    print("   ✅ three chunks, one frame")
+
+def test_wire_savings():
+    """16-bit encodings halve the audio bytes on the socket compared to float32"""
+    print("\n📉 Testing bytes on the wire...")
+    batch = [_chunk(0, 16000)]
+    frames = {dtype: _send(dtype, batch, False)[0][0] for dtype in ('float32', 'int16', 'bfloat16')}
+    sizes = {dtype: len(frame) for dtype, frame in frames.items()}
+    for dtype in ('int16', 'bfloat16'):
+        assert len(unpack_audio_frame(frames[dtype])[1]) == 16000 * 2
+        assert sizes[dtype] < 0.51 * sizes['float32']
+    print(f"   ✅ float32 {sizes['float32']} B, int16 {sizes['int16']} B, bfloat16 {sizes['bfloat16']} B")
+
+def main():
+    """Run all wire tests"""
+    print("📡 TrueTone Wire Tests")
+    print("=" * 40)
+
+    test_chunk_reaches_socket()
+    test_batch_offsets()
+    test_wire_savings()
+
+    print("\n🎉 ALL WIRE TESTS PASSED!")
+
+if __name__ == "__main__":
+    main()